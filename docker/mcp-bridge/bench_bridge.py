@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Load generator for mcp_stdio_bridge.py.
+
+Hammers the bridge HTTP API at a fixed concurrency and reports latency
+percentiles, throughput and the bridge process' CPU time and peak RSS.
+
+Either point it at a running bridge (--url, plus --bridge-pid for CPU/RSS) or
+let it spawn one in front of fake_mcp_server.py (--spawn):
+
+  python3 bench_bridge.py --spawn --fake-args "--latency-ms 5 --payload-bytes 50000" \
+      --scenario tools-call --scenario rpc --scenario tools -c 32 -n 5000
+
+Scenarios:
+  tools-call   POST /tools/call {"name": --tool, "arguments": ...}
+  rpc          POST /rpc {"method": "tools/call", "params": ...}
+  tools        GET  /tools (served from the bridge cache after the first call)
+  batch        POST /rpc/batch with --batch-size tools/call items
+
+Each request carries a unique `seq` argument so single-flight coalescing does
+not collapse the load; pass --same-args to measure coalescing instead (the bridge
+must list the tool in MCP_BRIDGE_COALESCE_TOOLS).
+
+--max-p99-ms / --min-rps turn the run into a regression gate (exit code 1).
+--verify also fails on malformed response bodies (invalid JSON, unexpected
+envelope members), e.g. to check the raw result passthrough against child replies
+with a member after `result`:
+
+  python3 bench_bridge.py --spawn --verify --fake-args "--trailing-meta --payload-bytes 50000" \
+      --bridge-env MCP_BRIDGE_RAW_PASSTHROUGH_MIN_BYTES=10 --scenario rpc --scenario batch -n 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+
+HERE = Path(__file__).resolve().parent
+SCENARIOS = ("tools-call", "rpc", "tools", "batch")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the MCP stdio bridge")
+    parser.add_argument("--url", default="http://127.0.0.1:8070", help="Bridge base URL (ignored with --spawn)")
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="Scenario to run (repeatable, default: tools-call)",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="Concurrent client connections")
+    parser.add_argument("-n", "--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.0,
+        help="Run each scenario for N seconds instead of a fixed request count",
+    )
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests before each scenario")
+    parser.add_argument("--tool", default="work", help="Tool used by tools-call/rpc/batch")
+    parser.add_argument("--arguments", default="{}", help="JSON object merged into the tool arguments")
+    parser.add_argument("--batch-size", type=int, default=10, help="Items per /rpc/batch request")
+    parser.add_argument("--same-args", action="store_true", help="Do not add a unique `seq` argument")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request socket timeout (seconds)")
+    parser.add_argument("--bridge-pid", type=int, default=0, help="Bridge pid for CPU/RSS sampling")
+    parser.add_argument("--spawn", action="store_true", help="Start a bridge in front of fake_mcp_server.py")
+    parser.add_argument("--fake-args", default="", help="Arguments for fake_mcp_server.py (with --spawn)")
+    parser.add_argument(
+        "--bridge-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra environment for the spawned bridge, e.g. MCP_BRIDGE_POOL_SIZE=4 (repeatable)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check every 200 response body (JSON, envelope members); bad ones count as `invalid-body` errors",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="Fail if any scenario's p99 exceeds this")
+    parser.add_argument("--min-rps", type=float, default=0.0, help="Fail if any scenario's req/s is below this")
+    return parser.parse_args()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class ProcSampler:
+    """Samples CPU time and RSS of one pid from /proc (Linux only)."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid = pid
+        self._interval = interval
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.peak_rss = 0
+        self._cpu_start = 0.0
+
+    def _cpu_seconds(self) -> float:
+        try:
+            with open(f"/proc/{self.pid}/stat", "rb") as handle:
+                # Fields after the parenthesised comm; utime/stime are 14/15 overall.
+                fields = handle.read().rsplit(b")", 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self._ticks
+        except (OSError, IndexError, ValueError):
+            return 0.0
+
+    def _rss(self) -> int:
+        try:
+            with open(f"/proc/{self.pid}/status", "rb") as handle:
+                for line in handle:
+                    if line.startswith(b"VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, IndexError, ValueError):
+            pass
+        return 0
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.peak_rss = max(self.peak_rss, self._rss())
+
+    def start(self) -> None:
+        self._stop.clear()
+        self.peak_rss = self._rss()
+        self._cpu_start = self._cpu_seconds()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._rss())
+        return {"cpu_sec": round(self._cpu_seconds() - self._cpu_start, 3), "peak_rss_mb": round(self.peak_rss / 2**20, 1)}
+
+
+class BridgeClient:
+    """One persistent HTTP connection per worker thread (reconnects if the bridge closes it)."""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def call(self, method: str, path: str, body: bytes | None) -> tuple[int, bytes]:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            self._conn.request(method, path, body=body, headers=headers)
+            response = self._conn.getresponse()
+            data = response.read()
+            if response.will_close:
+                self._conn.close()
+            return response.status, data
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            raise
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# Members of the bridge's success envelopes: {"ok", "result"} and JSON-RPC batch items.
+_ENVELOPE_KEYS = {"ok", "result", "jsonrpc", "id", "error"}
+
+
+def _valid_body(data: bytes) -> bool:
+    """A response body parses and its envelopes carry only bridge members, so a
+    child reply spliced in wrongly (e.g. with members after `result`) is caught."""
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return False
+    envelopes = payload if isinstance(payload, list) else [payload]
+    return all(isinstance(item, dict) and item.keys() <= _ENVELOPE_KEYS for item in envelopes)
+
+
+def _request_for(args: argparse.Namespace, scenario: str, seq: int) -> tuple[str, str, bytes | None]:
+    arguments: dict[str, Any] = dict(args.base_arguments)
+    if not args.same_args:
+        arguments["seq"] = seq
+    if scenario == "tools":
+        return "GET", "/tools", None
+    if scenario == "tools-call":
+        return "POST", "/tools/call", json.dumps({"name": args.tool, "arguments": arguments}).encode("utf-8")
+    if scenario == "rpc":
+        payload = {"method": "tools/call", "params": {"name": args.tool, "arguments": arguments}}
+        return "POST", "/rpc", json.dumps(payload).encode("utf-8")
+    items = []
+    for index in range(args.batch_size):
+        item_args = dict(arguments)
+        if not args.same_args:
+            item_args["seq"] = f"{seq}.{index}"
+        items.append(
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "tools/call",
+                "params": {"name": args.tool, "arguments": item_args},
+            }
+        )
+    return "POST", "/rpc/batch", json.dumps(items).encode("utf-8")
+
+
+def run_scenario(args: argparse.Namespace, scenario: str, host: str, port: int, sampler: ProcSampler | None) -> dict:
+    counter_lock = threading.Lock()
+    state = {"next": 0}
+    latencies: list[list[float]] = [[] for _ in range(args.concurrency)]
+    errors: list[dict[str, int]] = [{} for _ in range(args.concurrency)]
+
+    def take(limit: int, deadline: float) -> int | None:
+        with counter_lock:
+            seq = state["next"]
+            if deadline:
+                if time.monotonic() >= deadline:
+                    return None
+            elif seq >= limit:
+                return None
+            state["next"] = seq + 1
+            return seq
+
+    def worker(index: int, limit: int, deadline: float, record: bool) -> None:
+        client = BridgeClient(host, port, args.timeout)
+        try:
+            while True:
+                seq = take(limit, deadline)
+                if seq is None:
+                    return
+                method, path, body = _request_for(args, scenario, seq)
+                started = time.perf_counter()
+                try:
+                    status, data = client.call(method, path, body)
+                except Exception as exc:
+                    status = type(exc).__name__
+                else:
+                    if args.verify and status == 200 and not _valid_body(data):
+                        status = "invalid-body"
+                elapsed = time.perf_counter() - started
+                if not record:
+                    continue
+                latencies[index].append(elapsed)
+                if status != 200:
+                    errors[index][str(status)] = errors[index].get(str(status), 0) + 1
+        finally:
+            client.close()
+
+    def run(limit: int, deadline: float, record: bool) -> float:
+        state["next"] = 0
+        threads = [
+            threading.Thread(target=worker, args=(index, limit, deadline, record), daemon=True)
+            for index in range(args.concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    if args.warmup:
+        run(args.warmup, 0.0, False)
+
+    if sampler is not None:
+        sampler.start()
+    deadline = time.monotonic() + args.duration if args.duration else 0.0
+    wall = run(args.requests, deadline, True)
+    usage = sampler.stop() if sampler is not None else {}
+
+    values = sorted(value for chunk in latencies for value in chunk)
+    error_counts: dict[str, int] = {}
+    for chunk in errors:
+        for status, count in chunk.items():
+            error_counts[status] = error_counts.get(status, 0) + count
+    report = {
+        "scenario": scenario,
+        "requests": len(values),
+        "errors": sum(error_counts.values()),
+        "error_statuses": error_counts,
+        "wall_sec": round(wall, 3),
+        "rps": round(len(values) / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(values, 50) * 1000, 2),
+        "p90_ms": round(_percentile(values, 90) * 1000, 2),
+        "p99_ms": round(_percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+    if scenario == "batch":
+        report["items_per_sec"] = round(report["rps"] * args.batch_size, 1)
+    if usage:
+        report["bridge_cpu_sec"] = usage["cpu_sec"]
+        report["bridge_cpu_pct"] = round(100.0 * usage["cpu_sec"] / wall, 1) if wall else 0.0
+        report["bridge_peak_rss_mb"] = usage["peak_rss_mb"]
+    return report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _spawn_bridge(args: argparse.Namespace) -> tuple[subprocess.Popen, int]:
+    port = _free_port()
+    env = os.environ.copy()
+    env.update(
+        {
+            "MCP_BRIDGE_NAME": "bench-bridge",
+            "MCP_BRIDGE_HOST": "127.0.0.1",
+            "MCP_BRIDGE_PORT": str(port),
+            "MCP_BRIDGE_CWD": str(HERE),
+            "MCP_BRIDGE_COMMAND": shlex.join([sys.executable, str(HERE / "fake_mcp_server.py")])
+            + (" " + args.fake_args if args.fake_args else ""),
+        }
+    )
+    for item in args.bridge_env:
+        key, _, value = item.partition("=")
+        env[key.strip()] = value
+    if "--framing content-length" in args.fake_args or "--framing=content-length" in args.fake_args:
+        env.setdefault("MCP_BRIDGE_STDIO_PROTOCOL", "content-length")
+
+    proc = subprocess.Popen(
+        [sys.executable, str(HERE / "mcp_stdio_bridge.py")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"bridge exited during startup (code {proc.returncode})")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return proc, port
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("bridge did not become healthy within 30s")
+
+
+def _print_table(reports: list[dict]) -> None:
+    columns = ["scenario", "requests", "errors", "rps", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+    if any("bridge_cpu_pct" in report for report in reports):
+        columns += ["bridge_cpu_pct", "bridge_peak_rss_mb"]
+    widths = {column: max(len(column), *(len(str(report.get(column, ""))) for report in reports)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for report in reports:
+        print("  ".join(str(report.get(column, "")).ljust(widths[column]) for column in columns))
+    for report in reports:
+        if report["error_statuses"]:
+            print(f"[bench] {report['scenario']}: errors by status {report['error_statuses']}", file=sys.stderr)
+
+
+def main() -> int:
+    args = _parse_args()
+    args.base_arguments = json.loads(args.arguments)
+    if not isinstance(args.base_arguments, dict):
+        raise SystemExit("--arguments must be a JSON object")
+    scenarios = args.scenario or ["tools-call"]
+
+    proc: subprocess.Popen | None = None
+    if args.spawn:
+        proc, port = _spawn_bridge(args)
+        host, pid = "127.0.0.1", proc.pid
+        print(f"[bench] spawned bridge pid={pid} port={port}", file=sys.stderr)
+    else:
+        parsed = urlparse(args.url)
+        host, port, pid = parsed.hostname or "127.0.0.1", parsed.port or 80, args.bridge_pid
+
+    sampler = ProcSampler(pid) if pid and Path(f"/proc/{pid}").exists() else None
+    reports: list[dict] = []
+    try:
+        for scenario in scenarios:
+            reports.append(run_scenario(args, scenario, host, port, sampler))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    if args.json:
+        print(json.dumps({"concurrency": args.concurrency, "results": reports}, indent=2))
+    else:
+        _print_table(reports)
+
+    failed = False
+    for report in reports:
+        if args.max_p99_ms and report["p99_ms"] > args.max_p99_ms:
+            print(f"[bench] {report['scenario']}: p99 {report['p99_ms']}ms > {args.max_p99_ms}ms", file=sys.stderr)
+            failed = True
+        if args.min_rps and report["rps"] < args.min_rps:
+            print(f"[bench] {report['scenario']}: {report['rps']} req/s < {args.min_rps}", file=sys.stderr)
+            failed = True
+        if report["errors"]:
+            failed = failed or bool(args.max_p99_ms or args.min_rps or args.verify)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
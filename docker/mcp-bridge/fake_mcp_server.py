@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Stand-in stdio MCP server for benchmarking and smoke-testing the bridge.
+
+Speaks just enough MCP (initialize, tools/list, tools/call, notifications) to
+exercise mcp_stdio_bridge.py without a database or LLM behind it:
+
+- echo      returns its arguments
+- work      sleeps `latency_ms` (default --latency-ms +- --jitter-ms) and returns
+            a text block of `bytes` (default --payload-bytes); sends
+            notifications/progress when the caller passed a progressToken and
+            stops without replying on notifications/cancelled (as the MCP SDK does)
+- fail      answers with a JSON-RPC error
+- crash     exits the process (restart testing)
+
+With --out-of-order every request is handled on its own thread, so replies
+come back in completion order rather than request order.
+
+Example:
+  MCP_BRIDGE_COMMAND="python3 fake_mcp_server.py --latency-ms 20 --payload-bytes 200000"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Fake stdio MCP server for bridge benchmarks")
+    parser.add_argument(
+        "--framing",
+        choices=("jsonl", "content-length"),
+        default=os.getenv("FAKE_MCP_FRAMING", "jsonl"),
+        help="stdio framing used for replies (requests in either framing are accepted)",
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=float(os.getenv("FAKE_MCP_LATENCY_MS", "0")),
+        help="Default latency of the `work` tool",
+    )
+    parser.add_argument(
+        "--jitter-ms",
+        type=float,
+        default=float(os.getenv("FAKE_MCP_JITTER_MS", "0")),
+        help="Uniform +- jitter added to the `work` latency",
+    )
+    parser.add_argument(
+        "--payload-bytes",
+        type=int,
+        default=int(os.getenv("FAKE_MCP_PAYLOAD_BYTES", "256")),
+        help="Default size of the `work` tool's text result",
+    )
+    parser.add_argument(
+        "--progress-steps",
+        type=int,
+        default=int(os.getenv("FAKE_MCP_PROGRESS_STEPS", "4")),
+        help="notifications/progress messages sent by `work` when a progressToken is given",
+    )
+    parser.add_argument(
+        "--out-of-order",
+        action="store_true",
+        default=os.getenv("FAKE_MCP_OUT_OF_ORDER", "0") in {"1", "true", "yes", "on"},
+        help="Handle each request on its own thread; replies arrive in completion order",
+    )
+    parser.add_argument(
+        "--startup-ms",
+        type=float,
+        default=float(os.getenv("FAKE_MCP_STARTUP_MS", "0")),
+        help="Delay before the server starts reading stdin (simulates slow imports)",
+    )
+    parser.add_argument(
+        "--trailing-meta",
+        action="store_true",
+        default=os.getenv("FAKE_MCP_TRAILING_META", "0") in {"1", "true", "yes", "on"},
+        help="Write a `_meta` member after `result` in replies (valid JSON-RPC, unusual member order)",
+    )
+    return parser.parse_args()
+
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Return the arguments unchanged.",
+        "inputSchema": {"type": "object"},
+    },
+    {
+        "name": "work",
+        "description": "Sleep, then return a text payload of the requested size.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "latency_ms": {"type": "number"},
+                "bytes": {"type": "integer"},
+            },
+        },
+    },
+    {
+        "name": "fail",
+        "description": "Always answer with a JSON-RPC error.",
+        "inputSchema": {"type": "object"},
+    },
+    {
+        "name": "crash",
+        "description": "Terminate the server process.",
+        "inputSchema": {"type": "object"},
+    },
+]
+
+
+class FakeMcpServer:
+    def __init__(self, args: argparse.Namespace):
+        self._args = args
+        self._out = sys.stdout.buffer
+        self._write_lock = threading.Lock()
+        self._payload_cache: dict[int, str] = {}
+        self._cancelled: set[object] = set()
+
+    def _send(self, message: dict) -> None:
+        body = json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        if self._args.framing == "content-length":
+            frame = f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+        else:
+            frame = body + b"\n"
+        with self._write_lock:
+            self._out.write(frame)
+            self._out.flush()
+
+    def _reply(self, req_id: object, result: Any) -> None:
+        message = {"jsonrpc": "2.0", "id": req_id, "result": result}
+        if self._args.trailing_meta:
+            message["_meta"] = {"fake": {"trailing": True}}
+        self._send(message)
+
+    def _error(self, req_id: object, code: int, message: str) -> None:
+        self._send({"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}})
+
+    def _payload(self, size: int) -> str:
+        text = self._payload_cache.get(size)
+        if text is None:
+            # Non-ASCII filler so the UTF-8 paths in the bridge are exercised too.
+            unit = "Rechtssatz § 1295 ABGB – Schadenersatz. "
+            text = (unit * (size // len(unit.encode("utf-8")) + 1))[:size]
+            self._payload_cache[size] = text
+        return text
+
+    def _work(self, req_id: object, arguments: dict, meta: dict) -> None:
+        latency_ms = float(arguments.get("latency_ms", self._args.latency_ms))
+        if self._args.jitter_ms:
+            latency_ms += random.uniform(-self._args.jitter_ms, self._args.jitter_ms)
+        latency = max(0.0, latency_ms) / 1000.0
+        token = meta.get("progressToken")
+        steps = max(1, self._args.progress_steps) if token is not None else 1
+        for step in range(steps):
+            deadline = time.monotonic() + latency / steps
+            while time.monotonic() < deadline:
+                if req_id in self._cancelled:
+                    self._cancelled.discard(req_id)
+                    print(f"fake-mcp: request {req_id} cancelled", file=sys.stderr, flush=True)
+                    return
+                time.sleep(min(0.05, max(0.0, deadline - time.monotonic())))
+            if token is not None:
+                self._send(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "notifications/progress",
+                        "params": {"progressToken": token, "progress": step + 1, "total": steps},
+                    }
+                )
+        size = int(arguments.get("bytes", self._args.payload_bytes))
+        self._reply(req_id, {"content": [{"type": "text", "text": self._payload(size)}], "isError": False})
+
+    def handle(self, message: dict) -> None:
+        req_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params") if isinstance(message.get("params"), dict) else {}
+        if req_id is None:
+            # Cancellation only reaches a running `work` call with --out-of-order.
+            if method == "notifications/cancelled":
+                self._cancelled.add(params.get("requestId"))
+            # notifications/initialized, ...
+            return
+
+        if method == "initialize":
+            return self._reply(
+                req_id,
+                {
+                    "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+                    "capabilities": {"tools": {}},
+                    "serverInfo": {"name": "fake-mcp", "version": "1.0.0"},
+                },
+            )
+        if method == "tools/list":
+            return self._reply(req_id, {"tools": TOOLS})
+        if method == "ping":
+            return self._reply(req_id, {})
+        if method != "tools/call":
+            return self._error(req_id, -32601, f"Method not found: {method}")
+
+        name = params.get("name")
+        arguments = params.get("arguments") if isinstance(params.get("arguments"), dict) else {}
+        meta = params.get("_meta") if isinstance(params.get("_meta"), dict) else {}
+        if name == "echo":
+            return self._reply(req_id, {"content": [{"type": "text", "text": json.dumps(arguments)}]})
+        if name == "work":
+            return self._work(req_id, arguments, meta)
+        if name == "fail":
+            return self._error(req_id, -32000, "fake failure")
+        if name == "crash":
+            os._exit(3)
+        return self._error(req_id, -32602, f"Unknown tool: {name}")
+
+    def _dispatch(self, message: dict) -> None:
+        if self._args.out_of_order:
+            threading.Thread(target=self.handle, args=(message,), daemon=True).start()
+        else:
+            self.handle(message)
+
+    def serve(self) -> None:
+        stdin = sys.stdin.buffer
+        while True:
+            line = stdin.readline()
+            if not line:
+                return
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped[:15].lower() == b"content-length:":
+                length = int(stripped.split(b":", 1)[1])
+                while stdin.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                stripped = stdin.read(length)
+            self._dispatch(json.loads(stripped))
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.startup_ms:
+        time.sleep(args.startup_ms / 1000.0)
+    FakeMcpServer(args).serve()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,28 +3,70 @@
 Internal MCP bridge: stdio MCP server -> private HTTP API.
 
 This bridge is intended for private in-cluster usage only.
-It wraps a stdio-based MCP server process and exposes:
+It wraps a pool of stdio-based MCP server processes and exposes:
 - GET  /health
+- GET  /metrics     Prometheus text format (latency histograms, in-flight, pipe bytes, RSS)
 - GET  /tools
 - POST /tools/call  { "name": "...", "arguments": { ... } }
 - POST /tool/<name> { ...arguments... }
 - POST /rpc         { "method": "...", "params": { ... } }
+- POST /rpc/batch   [ {"jsonrpc": "2.0", "id": 1, "method": "...", "params": {...}}, ... ]
+- GET  /cache       response cache counters (POST /cache/clear empties it)
+- POST /tools/call/stream, /tool/<name>/stream, /rpc/stream
+                    same calls as Server-Sent Events (progress, then result)
+
+MCP_BRIDGE_SERVER_MODE=asyncio swaps the thread-pool HTTP server for an
+asyncio front end that talks to the children over asyncio subprocess pipes.
+Both front ends keep HTTP/1.1 connections open between requests
+(MCP_BRIDGE_KEEPALIVE_TIMEOUT_SEC, 0 = close after every response).
+JSON responses from MCP_BRIDGE_COMPRESS_MIN_BYTES on are compressed with the
+best codec the client's Accept-Encoding allows (zstd, br, gzip).
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import functools
+import io
 import json
 import os
+import queue
+import re
+import select
 import shlex
 import signal
+import socket
 import subprocess
 import sys
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import zlib
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
+from typing import Any, Callable
 from urllib.parse import unquote, urlparse
 
+try:  # optional fast JSON backends; stdlib json is always the fallback
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:  # optional response codecs; gzip (zlib) is always available
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 BRIDGE_NAME = os.getenv("MCP_BRIDGE_NAME", "mcp-bridge").strip() or "mcp-bridge"
 BRIDGE_PORT = int(os.getenv("MCP_BRIDGE_PORT", "8070"))
@@ -37,23 +79,715 @@ MCP_PROTOCOL_VERSION = os.getenv("MCP_PROTOCOL_VERSION", "2024-11-05")
 MCP_BRIDGE_STDIO_PROTOCOL = (
     os.getenv("MCP_BRIDGE_STDIO_PROTOCOL", "jsonl").strip().lower() or "jsonl"
 )
+POOL_SIZE = max(1, int(os.getenv("MCP_BRIDGE_POOL_SIZE", "1")))
+SERVER_MODE = os.getenv("MCP_BRIDGE_SERVER_MODE", "threaded").strip().lower() or "threaded"
+WORKER_MAX_FAILURES = max(1, int(os.getenv("MCP_BRIDGE_WORKER_MAX_FAILURES", "3")))
+RESTART_ENABLED = os.getenv("MCP_BRIDGE_RESTART", "1").strip().lower() not in {"0", "false", "no", "off"}
+RESTART_BACKOFF_SEC = float(os.getenv("MCP_BRIDGE_RESTART_BACKOFF_SEC", "1"))
+RESTART_BACKOFF_MAX_SEC = float(os.getenv("MCP_BRIDGE_RESTART_BACKOFF_MAX_SEC", "60"))
+SUPERVISE_INTERVAL_SEC = float(os.getenv("MCP_BRIDGE_SUPERVISE_INTERVAL_SEC", "1"))
+WARM_STANDBY = os.getenv("MCP_BRIDGE_WARM_STANDBY", "0").strip().lower() in {"1", "true", "yes", "on"}
+CACHE_MAX_ENTRIES = int(os.getenv("MCP_BRIDGE_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL_SEC = float(os.getenv("MCP_BRIDGE_CACHE_TTL_SEC", "300"))
+CACHE_TOOLS_LIST_TTL_SEC = float(os.getenv("MCP_BRIDGE_CACHE_TOOLS_LIST_TTL_SEC", "60"))
+# Comma-separated allowlist of read-only tools, optionally with TTL: "tool_a:600,tool_b"
+CACHE_TOOLS = os.getenv("MCP_BRIDGE_CACHE_TOOLS", "").strip()
+BATCH_MAX_ITEMS = int(os.getenv("MCP_BRIDGE_BATCH_MAX_ITEMS", "100"))
+STREAM_KEEPALIVE_SEC = float(os.getenv("MCP_BRIDGE_STREAM_KEEPALIVE_SEC", "15"))
+# Replies at least this large skip the JSON decode/encode cycle (0 = always decode).
+RAW_PASSTHROUGH_MIN_BYTES = int(os.getenv("MCP_BRIDGE_RAW_PASSTHROUGH_MIN_BYTES", "65536"))
+# auto | orjson | msgspec | json
+JSON_BACKEND_REQUESTED = os.getenv("MCP_BRIDGE_JSON_BACKEND", "auto").strip().lower() or "auto"
+# Comma-separated allowlist of idempotent tools (or methods such as tools/list) whose identical
+# in-flight calls may share one execution; empty = coalescing off.
+COALESCE_TOOLS = os.getenv("MCP_BRIDGE_COALESCE_TOOLS", "").strip()
+# Idle seconds before a persistent HTTP/1.1 connection is closed (0 = HTTP/1.0, one request per connection).
+KEEPALIVE_TIMEOUT_SEC = float(os.getenv("MCP_BRIDGE_KEEPALIVE_TIMEOUT_SEC", "15"))
+KEEPALIVE_MAX_REQUESTS = max(1, int(os.getenv("MCP_BRIDGE_KEEPALIVE_MAX_REQUESTS", "1000")))
+# Threaded mode serves connections from a fixed pool; further connections queue.
+HTTP_THREADS = max(1, int(os.getenv("MCP_BRIDGE_HTTP_THREADS", "64")))
+LISTEN_BACKLOG = max(1, int(os.getenv("MCP_BRIDGE_LISTEN_BACKLOG", "128")))
+# Admission control: calls running on the children at once (0 = unlimited) and
+# how many may wait for a slot before new calls are shed with 429.
+MAX_IN_FLIGHT = int(os.getenv("MCP_BRIDGE_MAX_IN_FLIGHT", "64"))
+QUEUE_MAX = int(os.getenv("MCP_BRIDGE_QUEUE_MAX", "128"))
+QUEUE_TIMEOUT_SEC = float(os.getenv("MCP_BRIDGE_QUEUE_TIMEOUT_SEC", "30"))
+# Long-running tools get their own, smaller share of MAX_IN_FLIGHT and queue behind interactive calls.
+LONG_RUNNING_TOOLS = os.getenv("MCP_BRIDGE_LONG_RUNNING_TOOLS", "").strip()
+LONG_RUNNING_MAX_IN_FLIGHT = int(os.getenv("MCP_BRIDGE_LONG_RUNNING_MAX_IN_FLIGHT", "2"))
+LONG_RUNNING_QUEUE_TIMEOUT_SEC = float(os.getenv("MCP_BRIDGE_LONG_RUNNING_QUEUE_TIMEOUT_SEC", "300"))
+# Per-tool concurrency limits: "run_exam:1,run_cct:1"
+TOOL_CONCURRENCY = os.getenv("MCP_BRIDGE_TOOL_CONCURRENCY", "").strip()
+# Abandoned calls (timeout, client gone) get an MCP notifications/cancelled so
+# the child stops working on them; the HTTP connection is checked for a
+# disconnect every MCP_BRIDGE_DISCONNECT_POLL_SEC while a call waits (0 = off).
+CANCEL_ENABLED = os.getenv("MCP_BRIDGE_CANCEL", "1").strip().lower() not in {"0", "false", "no", "off"}
+DISCONNECT_POLL_SEC = float(os.getenv("MCP_BRIDGE_DISCONNECT_POLL_SEC", "1"))
+# JSON responses from this size on are compressed if the client's Accept-Encoding
+# allows it (0 = never); codecs in server preference order, `name:level`.
+COMPRESS_MIN_BYTES = int(os.getenv("MCP_BRIDGE_COMPRESS_MIN_BYTES", "65536"))
+COMPRESS_ENCODINGS = os.getenv("MCP_BRIDGE_COMPRESS_ENCODINGS", "zstd:3,br:4,gzip:3").strip()
 
 
 def _log(msg: str) -> None:
     print(f"[{BRIDGE_NAME}] {msg}", file=sys.stderr, flush=True)
 
 
-class StdioMcpClient:
-    def __init__(self, command: str, cwd: str):
-        if not command:
-            raise RuntimeError("MCP_BRIDGE_COMMAND is required")
+def _select_json_backend(requested: str) -> str:
+    if requested in {"auto", "orjson"} and orjson is not None:
+        return "orjson"
+    if requested in {"auto", "msgspec"} and msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+JSON_BACKEND = _select_json_backend(JSON_BACKEND_REQUESTED)
+_FAST_JSON_ERRORS: tuple[type[BaseException], ...] = (ValueError, TypeError, OverflowError)
+if msgspec is not None:
+    _FAST_JSON_ERRORS += (msgspec.MsgspecError,)
+
+
+def _json_loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse with the fast backend; input it rejects (invalid UTF-8, NaN,
+    >64-bit ints) is retried with stdlib, decoding bytes with errors="replace"."""
+    try:
+        if JSON_BACKEND == "orjson":
+            return orjson.loads(data)
+        if JSON_BACKEND == "msgspec":
+            return msgspec.json.decode(data)
+    except _FAST_JSON_ERRORS:
+        pass
+    if not isinstance(data, str):
+        data = str(data, "utf-8", "replace")
+    return json.loads(data)
+
+
+def _json_dumps_bytes(value: Any) -> bytes:
+    """Compact UTF-8 JSON (ensure_ascii=False semantics) from whichever backend is active."""
+    try:
+        if JSON_BACKEND == "orjson":
+            return orjson.dumps(value)
+        if JSON_BACKEND == "msgspec":
+            return msgspec.json.encode(value)
+    except _FAST_JSON_ERRORS:
+        pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ClientDisconnected(ConnectionError):
+    """The HTTP client went away while its MCP call was queued or in flight."""
+
+
+class McpRemoteError(RuntimeError):
+    """JSON-RPC error reply from the MCP server (the worker itself is healthy)."""
+
+    def __init__(self, method: str, error: object):
+        super().__init__(f"MCP error for {method}: {error}")
+        self.error = error
+
+
+def _parse_command(command: str, cwd: str) -> list[str]:
+    if not command:
+        raise RuntimeError("MCP_BRIDGE_COMMAND is required")
+
+    argv = shlex.split(command)
+    if not argv:
+        raise RuntimeError("MCP_BRIDGE_COMMAND could not be parsed")
+
+    if not Path(cwd).exists():
+        raise RuntimeError(f"MCP_BRIDGE_CWD does not exist: {cwd}")
+    return argv
+
+
+def _stdio_protocol() -> str:
+    return "content-length" if MCP_BRIDGE_STDIO_PROTOCOL in {"content-length", "lsp"} else "jsonl"
+
+
+def _frame_message(message: dict, stdio_protocol: str) -> bytes:
+    started = time.perf_counter()
+    body = _json_dumps_bytes(message)
+    METRICS.observe_json("encode", "stdio", time.perf_counter() - started)
+    if stdio_protocol == "content-length":
+        return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+    # MCP SDK >= 1.0 uses line-delimited JSON over stdio.
+    return body + b"\n"
+
+
+def _normalize_request_id(value: object) -> object:
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+def _initialize_params() -> dict:
+    return {
+        "protocolVersion": MCP_PROTOCOL_VERSION,
+        "capabilities": {},
+        "clientInfo": {"name": BRIDGE_NAME, "version": "1.0.0"},
+    }
+
+
+def _with_progress_token(params: dict | None, token: object) -> dict:
+    """Copy params and ask the server for notifications/progress under `token`."""
+    out = dict(params or {})
+    meta = dict(out.get("_meta") or {})
+    meta["progressToken"] = token
+    out["_meta"] = meta
+    return out
+
+
+def _progress_token(message: dict) -> object:
+    if message.get("method") != "notifications/progress":
+        return None
+    params = message.get("params")
+    if not isinstance(params, dict):
+        return None
+    return params.get("progressToken")
+
+
+def _cancel_notification(req_id: object, reason: str) -> dict:
+    return {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": req_id, "reason": reason}}
+
+
+# Set by the threaded HTTP front end for the duration of a request: returns
+# True once the caller has closed its connection. Unset (None) elsewhere.
+_CLIENT_GONE: contextvars.ContextVar[Callable[[], bool] | None] = contextvars.ContextVar(
+    "mcp_bridge_client_gone", default=None
+)
+
+
+def _wait_or_gone(event: threading.Event, timeout: float) -> bool | None:
+    """Event.wait that also watches the caller's connection; None if it went away."""
+    gone = _CLIENT_GONE.get()
+    if gone is None or DISCONNECT_POLL_SEC <= 0:
+        return event.wait(max(0.0, timeout))
+    deadline = time.monotonic() + timeout
+    while not event.wait(max(0.0, min(deadline - time.monotonic(), DISCONNECT_POLL_SEC))):
+        if time.monotonic() >= deadline:
+            return False
+        if gone():
+            return None
+    return True
+
+
+# Tool calls range from millisecond lookups to 20-minute exam runs.
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+def _prom_escape(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prom_labels(**labels: object) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_prom_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _rss_bytes(pid: int | str | None) -> int | None:
+    """Resident set size from /proc (Linux only; None elsewhere or once the pid is gone)."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", "rb") as handle:
+            for line in handle:
+                if line.startswith(b"VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def _outcome(error: Exception | None) -> str:
+    if error is None:
+        return "ok"
+    if isinstance(error, McpRemoteError):
+        return "mcp_error"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    if isinstance(error, ClientDisconnected):
+        return "cancelled"
+    return "error"
+
+
+class BridgeMetrics:
+    """Process-wide counters and latency histograms, exported on GET /metrics.
+
+    Worker gauges (in-flight, RSS, restarts) and cache/coalescing counters are
+    read from their owners at scrape time; only event counts live here so they
+    stay monotonic across worker restarts.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = _LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        # (method, tool) -> [per-bucket counts..., sum, count]
+        self._latency: dict[tuple[str, str], list[float]] = {}
+        self._requests: dict[tuple[str, str, str], int] = {}
+        self._http: dict[tuple[str, str, int], int] = {}
+        self._json: dict[tuple[str, str], list[float]] = {}
+        self._stdio_bytes = {"in": 0, "out": 0}
+        self.late_replies = 0
+        self.http_connections = 0
+        self._cancelled: dict[str, int] = {}
+        # encoding -> [bytes in, bytes out, seconds, responses]
+        self._compression: dict[str, list[float]] = {}
+
+    def observe_call(self, method: str, params: dict | None, seconds: float, error: Exception | None) -> None:
+        tool = str(params.get("name", "")) if method == "tools/call" and isinstance(params, dict) else ""
+        key = (method, tool)
+        with self._lock:
+            series = self._latency.get(key)
+            if series is None:
+                series = self._latency[key] = [0.0] * (len(self._buckets) + 2)
+            for index, bound in enumerate(self._buckets):
+                if seconds <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += seconds
+            series[-1] += 1
+            outcome_key = (method, tool, _outcome(error))
+            self._requests[outcome_key] = self._requests.get(outcome_key, 0) + 1
+
+    def observe_json(self, op: str, where: str, seconds: float) -> None:
+        with self._lock:
+            series = self._json.setdefault((op, where), [0.0, 0])
+            series[0] += seconds
+            series[1] += 1
+
+    def add_stdio_bytes(self, direction: str, size: int) -> None:
+        with self._lock:
+            self._stdio_bytes[direction] += size
+
+    def count_late_reply(self) -> None:
+        with self._lock:
+            self.late_replies += 1
+
+    def observe_compression(self, encoding: str, size_in: int, size_out: int, seconds: float) -> None:
+        with self._lock:
+            series = self._compression.setdefault(encoding, [0, 0, 0.0, 0])
+            series[0] += size_in
+            series[1] += size_out
+            series[2] += seconds
+            series[3] += 1
 
-        argv = shlex.split(command)
-        if not argv:
-            raise RuntimeError("MCP_BRIDGE_COMMAND could not be parsed")
+    def count_cancelled(self, reason: str, count: int = 1) -> None:
+        with self._lock:
+            self._cancelled[reason] = self._cancelled.get(reason, 0) + count
+
+    def count_http_connection(self) -> None:
+        with self._lock:
+            self.http_connections += 1
+
+    def count_http(self, method: str, path: str, status: int) -> None:
+        key = (method, _route_label(path), int(status))
+        with self._lock:
+            self._http[key] = self._http.get(key, 0) + 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            latency = {key: list(series) for key, series in self._latency.items()}
+            requests = dict(self._requests)
+            http = dict(self._http)
+            json_timing = {key: list(series) for key, series in self._json.items()}
+            stdio_bytes = dict(self._stdio_bytes)
+            late_replies = self.late_replies
+            http_connections = self.http_connections
+            cancelled = dict(self._cancelled)
+            compression = {key: list(series) for key, series in self._compression.items()}
+
+        name = "mcp_bridge_request_duration_seconds"
+        lines = [
+            f"# HELP {name} Latency of MCP requests sent to the stdio children.",
+            f"# TYPE {name} histogram",
+        ]
+        for (method, tool), series in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(self._buckets, series):
+                cumulative += int(count)
+                lines.append(f"{name}_bucket{_prom_labels(method=method, tool=tool, le=bound)} {cumulative}")
+            lines.append(f"{name}_bucket{_prom_labels(method=method, tool=tool, le='+Inf')} {int(series[-1])}")
+            lines.append(f"{name}_sum{_prom_labels(method=method, tool=tool)} {series[-2]:.6f}")
+            lines.append(f"{name}_count{_prom_labels(method=method, tool=tool)} {int(series[-1])}")
+
+        lines += [
+            "# HELP mcp_bridge_requests_total MCP requests by outcome (ok, mcp_error, timeout, cancelled, error).",
+            "# TYPE mcp_bridge_requests_total counter",
+        ]
+        for (method, tool, outcome), count in sorted(requests.items()):
+            lines.append(f"mcp_bridge_requests_total{_prom_labels(method=method, tool=tool, outcome=outcome)} {count}")
+
+        lines += [
+            "# HELP mcp_bridge_http_responses_total HTTP responses by route and status.",
+            "# TYPE mcp_bridge_http_responses_total counter",
+        ]
+        for (method, route, status), count in sorted(http.items()):
+            labels = _prom_labels(method=method, route=route, status=status)
+            lines.append(f"mcp_bridge_http_responses_total{labels} {count}")
+        lines += [
+            "# HELP mcp_bridge_http_connections_total Accepted HTTP connections (responses / connections = reuse).",
+            "# TYPE mcp_bridge_http_connections_total counter",
+            f"mcp_bridge_http_connections_total {http_connections}",
+        ]
+
+        lines += [
+            "# HELP mcp_bridge_json_seconds_total Time spent encoding/decoding JSON.",
+            "# TYPE mcp_bridge_json_seconds_total counter",
+        ]
+        for (op, where), series in sorted(json_timing.items()):
+            lines.append(f"mcp_bridge_json_seconds_total{_prom_labels(op=op, where=where)} {series[0]:.6f}")
+        lines += [
+            "# HELP mcp_bridge_json_operations_total JSON encode/decode operations.",
+            "# TYPE mcp_bridge_json_operations_total counter",
+        ]
+        for (op, where), series in sorted(json_timing.items()):
+            lines.append(f"mcp_bridge_json_operations_total{_prom_labels(op=op, where=where)} {int(series[1])}")
+
+        lines += [
+            "# HELP mcp_bridge_stdio_bytes_total Bytes moved over the children's stdio pipes.",
+            "# TYPE mcp_bridge_stdio_bytes_total counter",
+        ]
+        for direction, count in sorted(stdio_bytes.items()):
+            lines.append(f"mcp_bridge_stdio_bytes_total{_prom_labels(direction=direction)} {count}")
+
+        lines += [
+            "# HELP mcp_bridge_late_replies_total Replies that arrived after their request timed out.",
+            "# TYPE mcp_bridge_late_replies_total counter",
+            f"mcp_bridge_late_replies_total {late_replies}",
+        ]
+        lines += [
+            "# HELP mcp_bridge_cancelled_total Requests abandoned by the bridge, by reason (timeout, client_disconnected).",
+            "# TYPE mcp_bridge_cancelled_total counter",
+        ]
+        for reason, count in sorted(cancelled.items()):
+            lines.append(f"mcp_bridge_cancelled_total{_prom_labels(reason=reason)} {count}")
+
+        lines += [
+            "# HELP mcp_bridge_compression_bytes_total Response bytes before (in) and after (out) compression.",
+            "# TYPE mcp_bridge_compression_bytes_total counter",
+        ]
+        for encoding, series in sorted(compression.items()):
+            lines.append(f"mcp_bridge_compression_bytes_total{_prom_labels(encoding=encoding, direction='in')} {series[0]}")
+            lines.append(f"mcp_bridge_compression_bytes_total{_prom_labels(encoding=encoding, direction='out')} {series[1]}")
+        lines += [
+            "# HELP mcp_bridge_compression_saved_bytes_total Bytes not sent thanks to response compression.",
+            "# TYPE mcp_bridge_compression_saved_bytes_total counter",
+        ]
+        for encoding, series in sorted(compression.items()):
+            lines.append(f"mcp_bridge_compression_saved_bytes_total{_prom_labels(encoding=encoding)} {series[0] - series[1]}")
+        lines += [
+            "# HELP mcp_bridge_compression_seconds_total Time spent compressing responses.",
+            "# TYPE mcp_bridge_compression_seconds_total counter",
+        ]
+        for encoding, series in sorted(compression.items()):
+            lines.append(f"mcp_bridge_compression_seconds_total{_prom_labels(encoding=encoding)} {series[2]:.6f}")
+        lines += [
+            "# HELP mcp_bridge_compressed_responses_total Responses sent with a Content-Encoding.",
+            "# TYPE mcp_bridge_compressed_responses_total counter",
+        ]
+        for encoding, series in sorted(compression.items()):
+            lines.append(f"mcp_bridge_compressed_responses_total{_prom_labels(encoding=encoding)} {int(series[3])}")
+        return lines
+
+
+METRICS = BridgeMetrics()
+
+
+def _observe_call(method: str, params: dict | None, started: float, error: Exception | None) -> None:
+    METRICS.observe_call(method, params, time.perf_counter() - started, error)
+
+
+def _route_label(path: str) -> str:
+    """Collapse /tool/<name> so arbitrary tool names do not explode label cardinality."""
+    if path.startswith("/tool/"):
+        return "/tool/<name>/stream" if path.endswith("/stream") else "/tool/<name>"
+    return path if path in _ROUTES else "other"
+
+
+def _loads_timed(payload: bytes | memoryview | str, where: str) -> Any:
+    started = time.perf_counter()
+    message = _json_loads(payload)
+    METRICS.observe_json("decode", where, time.perf_counter() - started)
+    return message
+
+
+class RawJson:
+    """Already-encoded JSON value (a slice of a child's reply), spliced into
+    HTTP responses as-is instead of being decoded and re-encoded."""
+
+    __slots__ = ("data", "start", "end")
+
+    def __init__(self, data: bytes, start: int = 0, end: int | None = None):
+        self.data = data
+        self.start = start
+        self.end = len(data) if end is None else end
+
+    def view(self) -> memoryview:
+        return memoryview(self.data)[self.start : self.end]
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def decode(self) -> Any:
+        return _loads_timed(self.view(), "stdio")
+
+
+# `{"jsonrpc":"2.0","id":<id>,"result":` -- the member order the MCP Python SDK
+# writes (pydantic field order). Replies in any other layout are fully decoded.
+_REPLY_HEAD = re.compile(
+    rb'\s*\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"id"\s*:\s*(-?\d+|"[^"\\]*")\s*,\s*"result"\s*:\s*'
+)
+_JSON_WHITESPACE = b" \t\r\n"
+_CLOSERS = {ord("{"): ord("}"), ord("["): ord("]")}
+_BRACKETS = re.compile(rb"[{}\[\]]")
+# Strings plus escaped quotes the scan steps over before it gives up: results with
+# many small strings or quote-heavy text are decoded in full, which is then faster
+# than walking them in Python.
+_SCAN_STEPS_MAX = 1024
+
+
+def _value_end(data: bytes, start: int, end: int) -> int | None:
+    """End offset of the object/array starting at data[start], or None if it
+    does not close before `end` (or has too many strings to check cheaply).
+
+    Strings are skipped with bytes.find, so large text payloads cost one C-level
+    search per (escaped) quote; only the brackets between strings are counted.
+    """
+    depth = 0
+    steps = 0
+    pos = start
+    while pos < end:
+        quote = data.find(b'"', pos, end)
+        stop = end if quote < 0 else quote
+        for bracket in _BRACKETS.finditer(data, pos, stop):
+            if data[bracket.start()] in _CLOSERS:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return bracket.end()
+        if quote < 0:
+            return None
+        steps += 1
+        close = data.find(b'"', quote + 1, end)
+        while close > 0:
+            backslashes = 0
+            while data[close - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            steps += 1
+            if steps > _SCAN_STEPS_MAX:
+                return None
+            close = data.find(b'"', close + 1, end)
+        if close < 0 or steps > _SCAN_STEPS_MAX:
+            return None
+        pos = close + 1
+    return None
+
+
+def _decode_frame(data: bytes) -> Any:
+    """Decode one MCP message; large replies keep `result` as a RawJson slice.
+
+    Only the envelope head (jsonrpc, id) is parsed. `result` must be an object
+    or array and the last member: its brackets are matched (skipping strings)
+    and must close right before the envelope's closing brace. Replies with a
+    member after `result`, results too string-heavy to check cheaply (see
+    _value_end), error replies, notifications and other layouts are fully decoded.
+    """
+    if 0 < RAW_PASSTHROUGH_MIN_BYTES <= len(data):
+        started = time.perf_counter()
+        head = _REPLY_HEAD.match(data)
+        if head is not None:
+            start = head.end()
+            end = len(data)
+            while end > start and data[end - 1] in _JSON_WHITESPACE:
+                end -= 1
+            if end > start and data[end - 1] == ord("}"):
+                end -= 1
+                while end > start and data[end - 1] in _JSON_WHITESPACE:
+                    end -= 1
+                closer = _CLOSERS.get(data[start])
+                if closer is not None and data[end - 1] == closer and _value_end(data, start, end) == end:
+                    message = {"jsonrpc": "2.0", "id": json.loads(head.group(1)), "result": RawJson(data, start, end)}
+                    METRICS.observe_json("passthrough", "stdio", time.perf_counter() - started)
+                    return message
+    return _loads_timed(data, "stdio")
+
+
+# Just the envelope head of a reply (result or error), enough to read its id.
+_REPLY_ID = re.compile(rb'\s*\{\s*"jsonrpc"\s*:\s*"2\.0"\s*,\s*"id"\s*:\s*(-?\d+|"[^"\\]*")')
+
+
+class _CancelledIds:
+    """Ids the bridge sent notifications/cancelled for.
+
+    A child may still answer them (it finished first, or ignores cancellation);
+    such replies are recognized from their head and dropped without decoding.
+    Bounded so ids of children that never answer do not accumulate.
+    """
+
+    def __init__(self, limit: int = 1024):
+        self._limit = limit
+        self._ids: OrderedDict[object, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, req_id: object) -> None:
+        with self._lock:
+            self._ids[req_id] = None
+            if len(self._ids) > self._limit:
+                self._ids.popitem(last=False)
+
+    def placeholder(self, data: bytes | memoryview) -> dict | None:
+        """Id-only stand-in for a reply to a cancelled request, else None."""
+        if not self._ids:
+            return None
+        head = _REPLY_ID.match(data)
+        if head is None:
+            return None
+        req_id = _normalize_request_id(json.loads(head.group(1)))
+        with self._lock:
+            if req_id not in self._ids:
+                return None
+            del self._ids[req_id]
+        return {"jsonrpc": "2.0", "id": req_id}
+
+
+# Initial read size for the stdout frame reader; the buffer grows to the
+# largest message seen (multi-MB TE results) and is reused afterwards.
+_READ_CHUNK = 256 * 1024
+
+
+class _FrameReader:
+    """Chunked reader for MCP stdout on an unbuffered pipe.
+
+    Pulls large chunks into one reusable bytearray with `readinto`, scans for
+    newline / Content-Length boundaries in place and decodes each message
+    straight from a memoryview slice, so a frame is copied once (UTF-8 decode)
+    before `json.loads` instead of once per `readline`/`decode`/`strip`.
+    """
+
+    def __init__(self, raw, chunk_size: int = _READ_CHUNK, cancelled: _CancelledIds | None = None):
+        self._raw = raw
+        self._cancelled = cancelled
+        self._chunk = chunk_size
+        self._buf = bytearray(chunk_size)
+        self._start = 0
+        self._end = 0
+        self._scan = 0
+
+    def _fill(self, need: int) -> None:
+        """Read at least one chunk, making room for `need` more bytes first."""
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+        elif len(self._buf) - self._end < need and self._start:
+            # Drop consumed bytes; deleting from the front is a cheap memmove.
+            del self._buf[: self._start]
+            self._end -= self._start
+            self._scan -= self._start
+            self._start = 0
+        free = len(self._buf) - self._end
+        if free < need:
+            self._buf.extend(bytes(max(need - free, len(self._buf))))
+        with memoryview(self._buf)[self._end :] as view:
+            count = self._raw.readinto(view)
+        if not count:
+            raise EOFError("MCP process stdout closed")
+        self._end += count
+        METRICS.add_stdio_bytes("in", count)
+
+    def _line(self) -> tuple[int, int]:
+        """Consume the next line and return its [start, end) offsets (newline included)."""
+        while True:
+            newline = self._buf.find(b"\n", self._scan, self._end)
+            if newline >= 0:
+                start = self._start
+                self._start = self._scan = newline + 1
+                return start, newline + 1
+            self._scan = self._end
+            self._fill(self._chunk)
+
+    def _take(self, size: int) -> tuple[int, int]:
+        while self._end - self._start < size:
+            self._fill(size - (self._end - self._start))
+        start = self._start
+        self._start += size
+        self._scan = max(self._scan, self._start)
+        return start, start + size
+
+    def _decode(self, start: int, end: int) -> Any:
+        with memoryview(self._buf)[start:end] as view:
+            if self._cancelled is not None:
+                placeholder = self._cancelled.placeholder(view)
+                if placeholder is not None:
+                    return placeholder
+            if 0 < RAW_PASSTHROUGH_MIN_BYTES <= end - start:
+                # Copy once into an immutable frame that a RawJson result can own.
+                return _decode_frame(bytes(view))
+            return _loads_timed(view, "stdio")
+
+    def _read_framed(self, first_header: tuple[int, int]) -> Any:
+        headers: dict[str, str] = {}
+        start, end = first_header
+        while True:
+            decoded = self._buf[start:end].decode("ascii", errors="ignore").strip()
+            if not decoded:
+                break
+            if ":" in decoded:
+                key, value = decoded.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+            start, end = self._line()
+
+        content_length = int(headers.get("content-length", "0"))
+        if content_length <= 0:
+            raise RuntimeError("Missing or invalid Content-Length in MCP response")
+        return self._decode(*self._take(content_length))
+
+    def read_message(self, stdio_protocol: str) -> Any:
+        while True:
+            start, end = self._line()
+            # Only short lines can be blank separators; never slice a large frame.
+            if end - start <= 64 and self._buf[start:end].isspace():
+                continue
+            # Content-Length framing, or the compatibility fallback if a jsonl
+            # server still emits LSP framing.
+            if stdio_protocol == "content-length" or self._buf[start : start + 15].lower() == b"content-length:":
+                return self._read_framed((start, end))
+            return self._decode(start, end)
+
+
+class _PendingRequest:
+    """Waiter for one in-flight JSON-RPC id, resolved by the stdout reader.
+
+    Streaming requests also get an `events` queue that receives
+    ("progress", params) items and a final ("done", None) wakeup.
+    """
 
-        if not Path(cwd).exists():
-            raise RuntimeError(f"MCP_BRIDGE_CWD does not exist: {cwd}")
+    __slots__ = ("req_id", "event", "message", "error", "events")
+
+    def __init__(self, req_id: int, events: queue.Queue | None = None) -> None:
+        self.req_id = req_id
+        self.event = threading.Event()
+        self.message: dict | None = None
+        self.error: Exception | None = None
+        self.events = events
+
+    def resolve(self, message: dict) -> None:
+        self.message = message
+        self.event.set()
+        if self.events is not None:
+            self.events.put(("done", None))
+
+    def fail(self, error: Exception) -> None:
+        self.error = error
+        self.event.set()
+        if self.events is not None:
+            self.events.put(("done", None))
+
+
+class StdioMcpClient:
+    def __init__(self, command: str, cwd: str, worker_id: int = 0):
+        argv = _parse_command(command, cwd)
 
         child_env = os.environ.copy()
         self._proc = subprocess.Popen(
@@ -68,339 +802,2586 @@ class StdioMcpClient:
         if not self._proc.stdin or not self._proc.stdout or not self._proc.stderr:
             raise RuntimeError("Failed to open MCP process stdio pipes")
 
+        self.worker_id = worker_id
         self._lock = threading.Lock()
         self._next_id = 1
         self._initialized = False
-        self._responses: dict[object, dict] = {}
-        self._response_cv = threading.Condition()
+        self._pending: dict[object, _PendingRequest] = {}
+        self._pending_lock = threading.Lock()
         self._reader_error: Exception | None = None
-        self._stdio_protocol = (
-            "content-length"
-            if MCP_BRIDGE_STDIO_PROTOCOL in {"content-length", "lsp"}
-            else "jsonl"
-        )
+        self._stdio_protocol = _stdio_protocol()
+        self._cancelled = _CancelledIds()
+        self._reader = _FrameReader(self._proc.stdout, cancelled=self._cancelled)
+        self.timeouts = 0
+        self.late_replies = 0
+        self.cancelled = 0
+        self.on_exit = None
 
         self._stderr_thread = threading.Thread(
-            target=self._forward_stderr, name=f"{BRIDGE_NAME}-stderr", daemon=True
+            target=self._forward_stderr,
+            name=f"{BRIDGE_NAME}-w{worker_id}-stderr",
+            daemon=True,
         )
         self._stderr_thread.start()
         self._stdout_thread = threading.Thread(
-            target=self._forward_stdout, name=f"{BRIDGE_NAME}-stdout", daemon=True
+            target=self._forward_stdout,
+            name=f"{BRIDGE_NAME}-w{worker_id}-stdout",
+            daemon=True,
         )
         self._stdout_thread.start()
 
     def _forward_stderr(self) -> None:
         assert self._proc.stderr is not None
+        # The pipe is unbuffered (bufsize=0); buffer it so readline is not a syscall per byte.
+        stderr = io.BufferedReader(self._proc.stderr)
         while True:
-            line = self._proc.stderr.readline()
+            line = stderr.readline()
             if not line:
                 return
             try:
                 text = line.decode("utf-8", errors="replace").rstrip()
             except Exception:
                 text = repr(line)
-            _log(f"mcp: {text}")
+            _log(f"mcp[{self.worker_id}]: {text}")
+
+    @property
+    def reader_error(self) -> Exception | None:
+        return self._reader_error
+
+    def abort(self, error: Exception) -> None:
+        """Fail every pending request immediately (worker is being replaced)."""
+        self._fail_pending(error)
+
+    def _notify_exit(self) -> None:
+        if self.on_exit is not None:
+            self.on_exit()
+
+    def _fail_pending(self, error: Exception) -> None:
+        with self._pending_lock:
+            self._reader_error = error
+            waiters = list(self._pending.values())
+            self._pending.clear()
+        for waiter in waiters:
+            waiter.fail(error)
 
     def _forward_stdout(self) -> None:
         while True:
             try:
                 message = self._read_message()
             except EOFError:
-                with self._response_cv:
-                    self._reader_error = EOFError("MCP process stdout closed")
-                    self._response_cv.notify_all()
+                self._fail_pending(EOFError("MCP process stdout closed"))
+                self._notify_exit()
                 return
             except Exception as exc:
-                _log(f"mcp stdout reader failed: {exc}")
-                with self._response_cv:
-                    self._reader_error = exc
-                    self._response_cv.notify_all()
+                _log(f"mcp[{self.worker_id}] stdout reader failed: {exc}")
+                self._fail_pending(exc)
+                self._notify_exit()
                 return
 
             message_id = None
             if isinstance(message, dict):
                 message_id = message.get("id")
             if message_id is None:
+                token = _progress_token(message) if isinstance(message, dict) else None
+                if token is not None:
+                    with self._pending_lock:
+                        waiter = self._pending.get(_normalize_request_id(token))
+                    if waiter is not None and waiter.events is not None:
+                        waiter.events.put(("progress", message["params"]))
                 continue
-            with self._response_cv:
-                # Prevent response cache leak from timed out requests (max 1000 entries)
-                if len(self._responses) > 1000:
-                    keys_to_remove = list(self._responses.keys())[:200]
-                    for k in keys_to_remove:
-                        self._responses.pop(k, None)
-
-                self._responses[message_id] = message
-                self._responses[str(message_id)] = message
-                self._response_cv.notify_all()
+            with self._pending_lock:
+                waiter = self._pending.pop(_normalize_request_id(message_id), None)
+                if waiter is None:
+                    # Reply for a request that was abandoned (timeout, client gone); drop it.
+                    self.late_replies += 1
+                    METRICS.count_late_reply()
+                    continue
+            waiter.resolve(message)
 
     def is_alive(self) -> bool:
         return self._proc.poll() is None
 
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
     def _write_message(self, message: dict) -> None:
         assert self._proc.stdin is not None
-        body_text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
-        if self._stdio_protocol == "content-length":
-            body = body_text.encode("utf-8")
-            header = f"Content-Length: {len(body)}\r\n\r\n".encode("ascii")
-            self._proc.stdin.write(header)
-            self._proc.stdin.write(body)
-        else:
-            # MCP SDK >= 1.0 uses line-delimited JSON over stdio.
-            self._proc.stdin.write((body_text + "\n").encode("utf-8"))
+        frame = _frame_message(message, self._stdio_protocol)
+        self._proc.stdin.write(frame)
         self._proc.stdin.flush()
+        METRICS.add_stdio_bytes("out", len(frame))
+
+    def _read_message(self) -> dict:
+        return self._reader.read_message(self._stdio_protocol)
+
+    def _submit_many(
+        self,
+        calls: list[tuple[str, dict | None]],
+        notifications: list[tuple[str, dict | None]] = (),
+        events: queue.Queue | None = None,
+    ) -> list[_PendingRequest]:
+        """Register waiters and write all requests to stdin in a single burst."""
+        if not self.is_alive():
+            raise RuntimeError("MCP process is not running")
+
+        with self._lock:
+            waiters: list[_PendingRequest] = []
+            frames: list[bytes] = []
+            for method, params in calls:
+                req_id = self._next_id
+                self._next_id += 1
+                waiters.append(_PendingRequest(req_id, events))
+                if events is not None:
+                    params = _with_progress_token(params, req_id)
+                request: dict[str, object] = {"jsonrpc": "2.0", "id": req_id, "method": method}
+                if params is not None:
+                    request["params"] = params
+                frames.append(_frame_message(request, self._stdio_protocol))
+            for method, params in notifications:
+                note: dict[str, object] = {"jsonrpc": "2.0", "method": method}
+                if params is not None:
+                    note["params"] = params
+                frames.append(_frame_message(note, self._stdio_protocol))
+
+            with self._pending_lock:
+                if self._reader_error is not None:
+                    raise RuntimeError(f"MCP stdout reader error: {self._reader_error}")
+                for waiter in waiters:
+                    self._pending[waiter.req_id] = waiter
+            try:
+                assert self._proc.stdin is not None
+                data = b"".join(frames)
+                self._proc.stdin.write(data)
+                self._proc.stdin.flush()
+                METRICS.add_stdio_bytes("out", len(data))
+            except Exception:
+                with self._pending_lock:
+                    for waiter in waiters:
+                        self._pending.pop(waiter.req_id, None)
+                raise
+        return waiters
+
+    def _submit(
+        self, method: str, params: dict | None, events: queue.Queue | None = None
+    ) -> _PendingRequest:
+        return self._submit_many([(method, params)], events=events)[0]
+
+    def _cancel(self, req_ids: list[int], reason: str) -> None:
+        """Tell the child to stop working on abandoned requests (best effort)."""
+        self.cancelled += len(req_ids)
+        METRICS.count_cancelled(reason, len(req_ids))
+        if not CANCEL_ENABLED or not self.is_alive():
+            return
+        frames = []
+        for req_id in req_ids:
+            self._cancelled.add(req_id)
+            frames.append(_frame_message(_cancel_notification(req_id, reason), self._stdio_protocol))
+        data = b"".join(frames)
+        try:
+            with self._lock:
+                assert self._proc.stdin is not None
+                self._proc.stdin.write(data)
+                self._proc.stdin.flush()
+            METRICS.add_stdio_bytes("out", len(data))
+        except (OSError, ValueError) as exc:
+            _log(f"mcp[{self.worker_id}] cancel failed: {exc}")
+
+    def _abandon(self, waiters: list[_PendingRequest], reason: str) -> bool:
+        """Forget waiters that are still unanswered and cancel them in the child.
+
+        False if the reader had already claimed every reply (they are about to resolve).
+        """
+        with self._pending_lock:
+            abandoned = [waiter.req_id for waiter in waiters if self._pending.pop(waiter.req_id, None) is not None]
+            if reason == "timeout":
+                self.timeouts += len(abandoned)
+        if abandoned:
+            self._cancel(abandoned, reason)
+        return bool(abandoned)
+
+    def _finish(self, waiter: _PendingRequest, method: str, timeout: float):
+        replied = _wait_or_gone(waiter.event, timeout)
+        if not replied:
+            reason = "timeout" if replied is False else "client_disconnected"
+            if self._abandon([waiter], reason):
+                if replied is None:
+                    raise ClientDisconnected(f"HTTP client disconnected during {method}")
+                raise TimeoutError(f"MCP request timed out: {method}")
+            # The reader already claimed the reply; it is about to resolve.
+            waiter.event.wait()
 
-    def _read_message_content_length(self) -> dict:
-        assert self._proc.stdout is not None
+        if waiter.error is not None:
+            raise RuntimeError(f"MCP stdout reader error: {waiter.error}")
+        message = waiter.message
+        assert message is not None
+        if "error" in message:
+            raise McpRemoteError(method, message["error"])
+        return message.get("result")
 
+    def request(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        waiter = self._submit(method, params)
+        return self._finish(waiter, method, timeout_sec or REQUEST_TIMEOUT_SEC)
+
+    def request_batch(
+        self,
+        calls: list[tuple[str, dict | None]],
+        notifications: list[tuple[str, dict | None]] = (),
+        timeout_sec: int | None = None,
+    ) -> list[tuple[Any, Exception | None]]:
+        """Send calls in one write; return (result, error) per call, in order."""
+        waiters = self._submit_many(calls, notifications)
+        deadline = time.monotonic() + (timeout_sec or REQUEST_TIMEOUT_SEC)
+        out: list[tuple[Any, Exception | None]] = []
+        for (method, _params), waiter in zip(calls, waiters):
+            try:
+                out.append((self._finish(waiter, method, deadline - time.monotonic()), None))
+            except ClientDisconnected:
+                self._abandon(waiters, "client_disconnected")
+                raise
+            except Exception as exc:
+                out.append((None, exc))
+        return out
+
+    def stream(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        """Yield ("progress", params) / ("keepalive", None) items, then ("result", result)."""
+        events: queue.Queue = queue.Queue()
+        waiter = self._submit(method, params, events)
+        deadline = time.monotonic() + (timeout_sec or REQUEST_TIMEOUT_SEC)
+        try:
+            while not waiter.event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, data = events.get(timeout=min(remaining, STREAM_KEEPALIVE_SEC))
+                except queue.Empty:
+                    yield "keepalive", None
+                    continue
+                if kind == "progress":
+                    yield kind, data
+        except GeneratorExit:
+            # The consumer stopped reading (client went away mid-stream).
+            self._abandon([waiter], "client_disconnected")
+            raise
+        yield "result", self._finish(waiter, method, deadline - time.monotonic())
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def notify(self, method: str, params: dict | None = None) -> None:
+        if not self.is_alive():
+            return
+        with self._lock:
+            msg: dict[str, object] = {"jsonrpc": "2.0", "method": method}
+            if params is not None:
+                msg["params"] = params
+            self._write_message(msg)
+
+    def initialize(self):
+        result = self.request("initialize", _initialize_params(), timeout_sec=INIT_TIMEOUT_SEC)
+        self.notify("notifications/initialized", {})
+        self._initialized = True
+        return result
+
+    def close(self) -> None:
+        if self._proc.poll() is not None:
+            return
+        try:
+            self._proc.terminate()
+            self._proc.wait(timeout=5)
+        except Exception:
+            try:
+                self._proc.kill()
+            except Exception:
+                pass
+
+
+class _WorkerSlot:
+    """Dispatch bookkeeping for one pooled MCP child process."""
+
+    def __init__(self, client: StdioMcpClient):
+        self.client = client
+        self.outstanding = 0
+        self.completed = 0
+        self.failed = 0
+        self.consecutive_failures = 0
+        self.last_error: str | None = None
+        self.restarts = 0
+        self.restart_failures = 0
+        self.next_restart_at = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return self.client.is_alive() and self.consecutive_failures < WORKER_MAX_FAILURES
+
+    def needs_restart(self) -> bool:
+        if not self.client.is_alive() or self.client.reader_error is not None:
+            return True
+        # Recycle a wedged child once nothing is waiting on it any more.
+        return self.consecutive_failures >= WORKER_MAX_FAILURES and self.outstanding == 0
+
+    def backoff(self) -> float:
+        return min(RESTART_BACKOFF_MAX_SEC, RESTART_BACKOFF_SEC * (2 ** self.restart_failures))
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.client.worker_id,
+            "pid": self.client.pid,
+            "alive": self.client.is_alive(),
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "completed": self.completed,
+            "failed": self.failed,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "restarts": self.restarts,
+            "pending": self.client.pending_count,
+            "timeouts": self.client.timeouts,
+            "cancelled": self.client.cancelled,
+            "late_replies": self.client.late_replies,
+        }
+
+
+class McpWorkerPool:
+    """N initialized MCP children with least-outstanding-requests dispatch.
+
+    A worker that keeps failing at the transport level (timeouts, dead pipe)
+    is marked unhealthy and only used when no healthy worker is left; MCP
+    error replies do not count against worker health.
+
+    A supervisor restarts dead or wedged workers with exponential backoff.
+    With warm standby enabled, an initialized spare child is swapped in
+    immediately and a new spare is spawned in the background.
+    """
+
+    client_class: type = StdioMcpClient
+
+    def __init__(self, command: str, cwd: str, size: int = 1, admission: AdmissionControl | None = None):
+        self._command = command
+        self._cwd = cwd
+        self.admission = admission or AdmissionControl.from_env()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._standby = None
+        self._supervisor: threading.Thread | asyncio.Task | None = None
+        self._slots: list[_WorkerSlot] = []
+        try:
+            for worker_id in range(max(1, size)):
+                self._slots.append(_WorkerSlot(self.client_class(command, cwd, worker_id=worker_id)))
+        except Exception:
+            for slot in self._slots:
+                if slot.client.is_alive():
+                    slot.client.close()
+            raise
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    def initialize(self):
+        result = None
+        for slot in self._slots:
+            worker_result = slot.client.initialize()
+            if result is None:
+                result = worker_result
+        return result
+
+    def is_alive(self) -> bool:
+        return any(slot.client.is_alive() for slot in self._slots)
+
+    def _acquire(self, weight: int = 1) -> _WorkerSlot:
+        with self._lock:
+            candidates = [slot for slot in self._slots if slot.healthy]
+            if not candidates:
+                candidates = [slot for slot in self._slots if slot.client.is_alive()]
+            if not candidates:
+                raise RuntimeError("MCP process is not running")
+            slot = min(candidates, key=lambda item: item.outstanding)
+            slot.outstanding += weight
+            return slot
+
+    def _release(self, slot: _WorkerSlot, error: Exception | None) -> None:
+        with self._lock:
+            slot.outstanding -= 1
+            # Neither a remote error nor a caller walking away says anything about the child.
+            if error is None or isinstance(error, (McpRemoteError, ClientDisconnected)):
+                slot.completed += 1
+                slot.consecutive_failures = 0
+                return
+            slot.failed += 1
+            slot.consecutive_failures += 1
+            slot.last_error = str(error)
+            if slot.consecutive_failures == WORKER_MAX_FAILURES:
+                _log(f"worker {slot.client.worker_id} marked unhealthy: {error}")
+
+    def request(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        with self.admission.admit([(method, params)]):
+            slot = self._acquire()
+            started = time.perf_counter()
+            try:
+                result = slot.client.request(method, params, timeout_sec=timeout_sec)
+            except Exception as exc:
+                self._release(slot, exc)
+                _observe_call(method, params, started, exc)
+                raise
+            self._release(slot, None)
+            _observe_call(method, params, started, None)
+            return result
+
+    def request_batch(
+        self,
+        calls: list[tuple[str, dict | None]],
+        notifications: list[tuple[str, dict | None]] = (),
+        timeout_sec: int | None = None,
+    ) -> list[tuple[Any, Exception | None]]:
+        if not calls and not notifications:
+            return []
+        try:
+            with self.admission.admit(calls or notifications):
+                slot = self._acquire(weight=len(calls))
+                started = time.perf_counter()
+                try:
+                    results = slot.client.request_batch(calls, notifications, timeout_sec=timeout_sec)
+                except Exception as exc:
+                    results = [(None, exc)] * len(calls)
+                for (method, params), (_result, error) in zip(calls, results):
+                    self._release(slot, error)
+                    _observe_call(method, params, started, error)
+                if results and isinstance(results[0][1], ClientDisconnected):
+                    raise results[0][1]
+                return results
+        except BridgeHttpError as exc:
+            return [(None, exc)] * len(calls)
+
+    def stream(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        with self.admission.admit([(method, params)]):
+            slot = self._acquire()
+            started = time.perf_counter()
+            error: Exception | None = None
+            try:
+                yield from slot.client.stream(method, params, timeout_sec=timeout_sec)
+            except GeneratorExit:
+                error = ClientDisconnected(f"HTTP client disconnected during {method}")
+                raise
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                self._release(slot, error)
+                _observe_call(method, params, started, error)
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [slot.snapshot() for slot in self._slots]
+
+    @property
+    def standby_ready(self) -> bool:
+        return self._standby is not None and self._standby.is_alive()
+
+    def _watch(self, client) -> None:
+        client.on_exit = self._wake.set
+
+    def _spawn(self, worker_id: int) -> StdioMcpClient:
+        client = self.client_class(self._command, self._cwd, worker_id=worker_id)
+        try:
+            client.initialize()
+        except Exception:
+            client.close()
+            raise
+        self._watch(client)
+        return client
+
+    def _take_standby(self):
+        replacement, self._standby = self._standby, None
+        if replacement is not None and not replacement.is_alive():
+            replacement.on_exit = None
+            replacement.close()
+            return None
+        return replacement
+
+    def _restart_failed(self, slot: _WorkerSlot, exc: Exception) -> None:
+        slot.restart_failures += 1
+        slot.next_restart_at = time.monotonic() + slot.backoff()
+        _log(f"worker {slot.client.worker_id} restart failed ({exc}); retry in {slot.backoff():.1f}s")
+
+    def _swap(self, slot: _WorkerSlot, replacement, source: str):
+        old = slot.client
+        replacement.worker_id = old.worker_id
+        with self._lock:
+            slot.client = replacement
+            slot.consecutive_failures = 0
+            slot.restart_failures = 0
+            slot.restarts += 1
+        _log(f"worker {old.worker_id} replaced by pid {replacement.pid} ({source})")
+        old.on_exit = None
+        # Fail whatever is still parked on the old child right away.
+        old.abort(RuntimeError("MCP worker restarted"))
+        return old
+
+    def _restart(self, slot: _WorkerSlot) -> None:
+        replacement = self._take_standby()
+        source = "standby" if replacement is not None else "cold start"
+        if replacement is None:
+            try:
+                replacement = self._spawn(slot.client.worker_id)
+            except Exception as exc:
+                self._restart_failed(slot, exc)
+                return
+        self._swap(slot, replacement, source).close()
+
+    def _due_for_restart(self) -> list[_WorkerSlot]:
+        now = time.monotonic()
+        return [slot for slot in self._slots if slot.needs_restart() and now >= slot.next_restart_at]
+
+    def _supervise(self) -> None:
+        while not self._stopping:
+            self._wake.wait(SUPERVISE_INTERVAL_SEC)
+            self._wake.clear()
+            if self._stopping:
+                return
+            for slot in self._due_for_restart():
+                self._restart(slot)
+            if WARM_STANDBY and not self.standby_ready and not self._stopping:
+                try:
+                    self._standby = self._spawn(-1)
+                except Exception as exc:
+                    _log(f"warm standby spawn failed: {exc}")
+
+    def start_supervisor(self) -> None:
+        for slot in self._slots:
+            self._watch(slot.client)
+        self._supervisor = threading.Thread(target=self._supervise, name=f"{BRIDGE_NAME}-supervisor", daemon=True)
+        self._supervisor.start()
+        # Let the first spare come up right away instead of after one interval.
+        self._wake.set()
+
+    def close(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._standby is not None:
+            self._standby.close()
+        for slot in self._slots:
+            slot.client.on_exit = None
+            slot.client.close()
+
+
+# Upper bound for one line / frame on the asyncio stdout reader (TE results
+# with original HTML can be several MB on a single JSONL line).
+_ASYNC_STREAM_LIMIT = 256 * 1024 * 1024
+
+
+class AsyncStdioMcpClient:
+    """asyncio counterpart of StdioMcpClient with one Future per pending id."""
+
+    def __init__(self, command: str, cwd: str, worker_id: int = 0):
+        self._argv = _parse_command(command, cwd)
+        self._cwd = cwd
+        self.worker_id = worker_id
+        self._proc: asyncio.subprocess.Process | None = None
+        self._next_id = 1
+        self._initialized = False
+        self._pending: dict[object, asyncio.Future] = {}
+        self._progress: dict[object, asyncio.Queue] = {}
+        self._reader_error: Exception | None = None
+        self._stdio_protocol = _stdio_protocol()
+        self._cancelled = _CancelledIds()
+        self._tasks: list[asyncio.Task] = []
+        self.timeouts = 0
+        self.late_replies = 0
+        self.cancelled = 0
+        self.on_exit = None
+
+    async def start(self) -> None:
+        self._proc = await asyncio.create_subprocess_exec(
+            *self._argv,
+            cwd=self._cwd,
+            env=os.environ.copy(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_ASYNC_STREAM_LIMIT,
+        )
+        self._tasks = [
+            asyncio.create_task(self._forward_stderr(), name=f"{BRIDGE_NAME}-w{self.worker_id}-stderr"),
+            asyncio.create_task(self._forward_stdout(), name=f"{BRIDGE_NAME}-w{self.worker_id}-stdout"),
+        ]
+
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def _forward_stderr(self) -> None:
+        assert self._proc is not None and self._proc.stderr is not None
+        while True:
+            line = await self._proc.stderr.readline()
+            if not line:
+                return
+            _log(f"mcp[{self.worker_id}]: {line.decode('utf-8', errors='replace').rstrip()}")
+
+    async def _read_framed_body(self, first_header: bytes) -> dict:
+        assert self._proc is not None and self._proc.stdout is not None
         headers: dict[str, str] = {}
+        line = first_header
         while True:
-            line = self._proc.stdout.readline()
+            decoded = line.decode("ascii", errors="ignore").strip()
+            if ":" in decoded:
+                key, value = decoded.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+            line = await self._proc.stdout.readline()
             if not line:
-                raise EOFError("MCP process stdout closed")
+                raise EOFError("MCP process stdout closed while reading headers")
             if line in (b"\n", b"\r\n"):
                 break
-            decoded = line.decode("ascii", errors="ignore").strip()
-            if not decoded or ":" not in decoded:
-                continue
-            key, value = decoded.split(":", 1)
-            headers[key.strip().lower()] = value.strip()
 
         content_length = int(headers.get("content-length", "0"))
         if content_length <= 0:
             raise RuntimeError("Missing or invalid Content-Length in MCP response")
-
-        payload = self._proc.stdout.read(content_length)
-        if len(payload) != content_length:
-            raise RuntimeError("Unexpected EOF while reading MCP response body")
-        return json.loads(payload.decode("utf-8"))
-
-    def _read_message_jsonl(self) -> dict:
-        assert self._proc.stdout is not None
-
+        try:
+            payload = await self._proc.stdout.readexactly(content_length)
+        except asyncio.IncompleteReadError:
+            raise RuntimeError("Unexpected EOF while reading MCP response body") from None
+        METRICS.add_stdio_bytes("in", content_length)
+        return self._cancelled.placeholder(payload) or _decode_frame(payload)
+
+    async def _read_message(self) -> dict:
+        assert self._proc is not None and self._proc.stdout is not None
         while True:
-            line = self._proc.stdout.readline()
+            line = await self._proc.stdout.readline()
             if not line:
                 raise EOFError("MCP process stdout closed")
-
-            text = line.decode("utf-8", errors="replace").strip()
-            if not text:
+            stripped = line.strip()
+            if not stripped:
                 continue
+            # Same LSP-framing fallback as the threaded reader.
+            if self._stdio_protocol == "content-length" or stripped[:15].lower() == b"content-length:":
+                return await self._read_framed_body(stripped)
+            METRICS.add_stdio_bytes("in", len(line))
+            return self._cancelled.placeholder(line) or _decode_frame(line)
 
-            # Compatibility fallback if a server still emits LSP framing.
-            if text.lower().startswith("content-length:"):
-                headers = {"content-length": text.split(":", 1)[1].strip()}
-                while True:
-                    header_line = self._proc.stdout.readline()
-                    if not header_line:
-                        raise EOFError("MCP process stdout closed while reading headers")
-                    if header_line in (b"\n", b"\r\n"):
-                        break
-                    decoded = header_line.decode("ascii", errors="ignore").strip()
-                    if not decoded or ":" not in decoded:
-                        continue
-                    key, value = decoded.split(":", 1)
-                    headers[key.strip().lower()] = value.strip()
-
-                content_length = int(headers.get("content-length", "0"))
-                if content_length <= 0:
-                    raise RuntimeError("Missing or invalid Content-Length in MCP response")
-                payload = self._proc.stdout.read(content_length)
-                if len(payload) != content_length:
-                    raise RuntimeError("Unexpected EOF while reading MCP response body")
-                return json.loads(payload.decode("utf-8"))
-
-            return json.loads(text)
-
-    def _read_message(self) -> dict:
-        if self._stdio_protocol == "content-length":
-            return self._read_message_content_length()
-        return self._read_message_jsonl()
-
-    def request(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+    async def _forward_stdout(self) -> None:
+        try:
+            while True:
+                message = await self._read_message()
+                message_id = message.get("id") if isinstance(message, dict) else None
+                if message_id is None:
+                    token = _progress_token(message) if isinstance(message, dict) else None
+                    events = self._progress.get(_normalize_request_id(token)) if token is not None else None
+                    if events is not None:
+                        events.put_nowait(("progress", message["params"]))
+                    continue
+                future = self._pending.pop(_normalize_request_id(message_id), None)
+                if future is None or future.done():
+                    # Reply for a request that was abandoned (timeout, client gone); drop it.
+                    self.late_replies += 1
+                    METRICS.count_late_reply()
+                    continue
+                future.set_result(message)
+        except EOFError as exc:
+            self._reader_error = exc
+        except Exception as exc:
+            _log(f"mcp[{self.worker_id}] stdout reader failed: {exc}")
+            self._reader_error = exc
+        self.abort(RuntimeError(f"MCP stdout reader error: {self._reader_error}"))
+        if self.on_exit is not None:
+            self.on_exit()
+
+    @property
+    def reader_error(self) -> Exception | None:
+        return self._reader_error
+
+    def abort(self, error: Exception) -> None:
+        """Fail every pending request immediately (worker is being replaced)."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _write_message(self, message: dict) -> None:
+        assert self._proc is not None and self._proc.stdin is not None
+        frame = _frame_message(message, self._stdio_protocol)
+        self._proc.stdin.write(frame)
+        await self._proc.stdin.drain()
+        METRICS.add_stdio_bytes("out", len(frame))
+
+    async def _submit(
+        self, method: str, params: dict | None, events: asyncio.Queue | None = None
+    ) -> tuple[int, asyncio.Future]:
         if not self.is_alive():
             raise RuntimeError("MCP process is not running")
-
-        timeout = timeout_sec or REQUEST_TIMEOUT_SEC
-        deadline = time.monotonic() + timeout
-
-        with self._lock:
+        if self._reader_error is not None:
+            raise RuntimeError(f"MCP stdout reader error: {self._reader_error}")
+
+        req_id = self._next_id
+        self._next_id += 1
+        if events is not None:
+            params = _with_progress_token(params, req_id)
+            self._progress[req_id] = events
+        request: dict[str, object] = {"jsonrpc": "2.0", "id": req_id, "method": method}
+        if params is not None:
+            request["params"] = params
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+        try:
+            await self._write_message(request)
+        except BaseException:
+            self._pending.pop(req_id, None)
+            self._progress.pop(req_id, None)
+            raise
+        return req_id, future
+
+    @staticmethod
+    def _result(message: dict, method: str):
+        if "error" in message:
+            raise McpRemoteError(method, message["error"])
+        return message.get("result")
+
+    def _abandon(self, req_ids: list[int], reason: str) -> None:
+        """Forget requests that are still unanswered and cancel them in the child (best effort)."""
+        abandoned = [req_id for req_id in req_ids if self._pending.pop(req_id, None) is not None]
+        if not abandoned:
+            return
+        if reason == "timeout":
+            self.timeouts += len(abandoned)
+        self.cancelled += len(abandoned)
+        METRICS.count_cancelled(reason, len(abandoned))
+        if not CANCEL_ENABLED or not self.is_alive():
+            return
+        assert self._proc is not None and self._proc.stdin is not None
+        frames = []
+        for req_id in abandoned:
+            self._cancelled.add(req_id)
+            frames.append(_frame_message(_cancel_notification(req_id, reason), self._stdio_protocol))
+        data = b"".join(frames)
+        try:
+            # No drain: this also runs while the caller's task is being cancelled.
+            self._proc.stdin.write(data)
+            METRICS.add_stdio_bytes("out", len(data))
+        except (OSError, RuntimeError) as exc:
+            _log(f"mcp[{self.worker_id}] cancel failed: {exc}")
+
+    async def request(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        req_id, future = await self._submit(method, params)
+        try:
+            message = await asyncio.wait_for(future, timeout_sec or REQUEST_TIMEOUT_SEC)
+        except TimeoutError:
+            self._abandon([req_id], "timeout")
+            raise TimeoutError(f"MCP request timed out: {method}") from None
+        except asyncio.CancelledError:
+            self._abandon([req_id], "client_disconnected")
+            raise
+        finally:
+            self._pending.pop(req_id, None)
+        return self._result(message, method)
+
+    async def request_batch(
+        self,
+        calls: list[tuple[str, dict | None]],
+        notifications: list[tuple[str, dict | None]] = (),
+        timeout_sec: int | None = None,
+    ) -> list[tuple[Any, Exception | None]]:
+        """Async counterpart of StdioMcpClient.request_batch."""
+        if not self.is_alive():
+            raise RuntimeError("MCP process is not running")
+        if self._reader_error is not None:
+            raise RuntimeError(f"MCP stdout reader error: {self._reader_error}")
+
+        loop = asyncio.get_running_loop()
+        req_ids: list[int] = []
+        futures: list[asyncio.Future] = []
+        frames: list[bytes] = []
+        for method, params in calls:
             req_id = self._next_id
             self._next_id += 1
-
             request: dict[str, object] = {"jsonrpc": "2.0", "id": req_id, "method": method}
             if params is not None:
                 request["params"] = params
-            self._write_message(request)
+            frames.append(_frame_message(request, self._stdio_protocol))
+            future = loop.create_future()
+            self._pending[req_id] = future
+            req_ids.append(req_id)
+            futures.append(future)
+        for method, params in notifications:
+            note: dict[str, object] = {"jsonrpc": "2.0", "method": method}
+            if params is not None:
+                note["params"] = params
+            frames.append(_frame_message(note, self._stdio_protocol))
 
-        while True:
-            remaining = deadline - time.monotonic()
-            if remaining <= 0:
+        assert self._proc is not None and self._proc.stdin is not None
+        try:
+            data = b"".join(frames)
+            self._proc.stdin.write(data)
+            await self._proc.stdin.drain()
+            METRICS.add_stdio_bytes("out", len(data))
+            if futures:
+                await asyncio.wait(futures, timeout=timeout_sec or REQUEST_TIMEOUT_SEC)
+                self._abandon([req_id for req_id, future in zip(req_ids, futures) if not future.done()], "timeout")
+        except asyncio.CancelledError:
+            self._abandon(req_ids, "client_disconnected")
+            raise
+        finally:
+            for req_id in req_ids:
+                self._pending.pop(req_id, None)
+
+        out: list[tuple[Any, Exception | None]] = []
+        for (method, _params), future in zip(calls, futures):
+            if not future.done():
+                future.cancel()
+                out.append((None, TimeoutError(f"MCP request timed out: {method}")))
+                continue
+            try:
+                out.append((self._result(future.result(), method), None))
+            except Exception as exc:
+                out.append((None, exc))
+        return out
+
+    async def stream(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        """Async counterpart of StdioMcpClient.stream."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        req_id, future = await self._submit(method, params, events)
+        future.add_done_callback(lambda _future: events.put_nowait(("done", None)))
+        deadline = loop.time() + (timeout_sec or REQUEST_TIMEOUT_SEC)
+        try:
+            while not future.done():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, data = await asyncio.wait_for(events.get(), min(remaining, STREAM_KEEPALIVE_SEC))
+                except TimeoutError:
+                    yield "keepalive", None
+                    continue
+                if kind == "progress":
+                    yield kind, data
+            if not future.done():
+                self._abandon([req_id], "timeout")
                 raise TimeoutError(f"MCP request timed out: {method}")
-            with self._response_cv:
-                message = self._responses.pop(req_id, None)
-                if message is None:
-                    message = self._responses.pop(str(req_id), None)
-                    if message is not None:
-                        self._responses.pop(req_id, None)
-                else:
-                    self._responses.pop(str(req_id), None)
-                if message is not None:
-                    if "error" in message:
-                        raise RuntimeError(f"MCP error for {method}: {message['error']}")
-                    return message.get("result")
-                if self._reader_error is not None:
-                    raise RuntimeError(f"MCP stdout reader error: {self._reader_error}")
-                self._response_cv.wait(timeout=remaining)
-
-    def notify(self, method: str, params: dict | None = None) -> None:
+            message = future.result()
+        except (GeneratorExit, asyncio.CancelledError):
+            # The consumer stopped reading (client went away mid-stream).
+            self._abandon([req_id], "client_disconnected")
+            raise
+        finally:
+            self._pending.pop(req_id, None)
+            self._progress.pop(req_id, None)
+        yield "result", self._result(message, method)
+
+    async def notify(self, method: str, params: dict | None = None) -> None:
         if not self.is_alive():
             return
-        with self._lock:
-            msg: dict[str, object] = {"jsonrpc": "2.0", "method": method}
-            if params is not None:
-                msg["params"] = params
-            self._write_message(msg)
-
-    def initialize(self):
-        result = self.request(
-            "initialize",
-            {
-                "protocolVersion": MCP_PROTOCOL_VERSION,
-                "capabilities": {},
-                "clientInfo": {"name": BRIDGE_NAME, "version": "1.0.0"},
-            },
-            timeout_sec=INIT_TIMEOUT_SEC,
-        )
-        self.notify("notifications/initialized", {})
+        msg: dict[str, object] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            msg["params"] = params
+        await self._write_message(msg)
+
+    async def initialize(self):
+        result = await self.request("initialize", _initialize_params(), timeout_sec=INIT_TIMEOUT_SEC)
+        await self.notify("notifications/initialized", {})
         self._initialized = True
         return result
 
-    def close(self) -> None:
-        if self._proc.poll() is not None:
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self.abort(RuntimeError("MCP worker closed"))
+        if not self.is_alive():
             return
+        assert self._proc is not None
         try:
             self._proc.terminate()
-            self._proc.wait(timeout=5)
+            await asyncio.wait_for(self._proc.wait(), timeout=5)
         except Exception:
-            try:
+            with contextlib.suppress(Exception):
                 self._proc.kill()
-            except Exception:
+
+
+class AsyncMcpWorkerPool(McpWorkerPool):
+    """asyncio variant of McpWorkerPool; dispatch bookkeeping is shared."""
+
+    client_class = AsyncStdioMcpClient
+
+    async def initialize(self):
+        result = None
+        for slot in self._slots:
+            await slot.client.start()
+            worker_result = await slot.client.initialize()
+            if result is None:
+                result = worker_result
+        return result
+
+    async def request(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        async with self.admission.admit_async([(method, params)]):
+            slot = self._acquire()
+            started = time.perf_counter()
+            try:
+                result = await slot.client.request(method, params, timeout_sec=timeout_sec)
+            except asyncio.CancelledError:
+                error = ClientDisconnected(f"HTTP client disconnected during {method}")
+                self._release(slot, error)
+                _observe_call(method, params, started, error)
+                raise
+            except Exception as exc:
+                self._release(slot, exc)
+                _observe_call(method, params, started, exc)
+                raise
+            self._release(slot, None)
+            _observe_call(method, params, started, None)
+            return result
+
+    async def request_batch(
+        self,
+        calls: list[tuple[str, dict | None]],
+        notifications: list[tuple[str, dict | None]] = (),
+        timeout_sec: int | None = None,
+    ) -> list[tuple[Any, Exception | None]]:
+        if not calls and not notifications:
+            return []
+        try:
+            async with self.admission.admit_async(calls or notifications):
+                slot = self._acquire(weight=len(calls))
+                started = time.perf_counter()
+                try:
+                    results = await slot.client.request_batch(calls, notifications, timeout_sec=timeout_sec)
+                except asyncio.CancelledError:
+                    error = ClientDisconnected("HTTP client disconnected during batch")
+                    for method, params in calls:
+                        self._release(slot, error)
+                        _observe_call(method, params, started, error)
+                    raise
+                except Exception as exc:
+                    results = [(None, exc)] * len(calls)
+                for (method, params), (_result, error) in zip(calls, results):
+                    self._release(slot, error)
+                    _observe_call(method, params, started, error)
+                return results
+        except BridgeHttpError as exc:
+            return [(None, exc)] * len(calls)
+
+    async def stream(self, method: str, params: dict | None = None, timeout_sec: int | None = None):
+        async with self.admission.admit_async([(method, params)]):
+            slot = self._acquire()
+            started = time.perf_counter()
+            error: Exception | None = None
+            try:
+                # aclosing: closing this generator must reach the client's stream at once.
+                async with contextlib.aclosing(slot.client.stream(method, params, timeout_sec=timeout_sec)) as events:
+                    async for item in events:
+                        yield item
+            except (GeneratorExit, asyncio.CancelledError):
+                error = ClientDisconnected(f"HTTP client disconnected during {method}")
+                raise
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                self._release(slot, error)
+                _observe_call(method, params, started, error)
+
+    async def _spawn(self, worker_id: int) -> AsyncStdioMcpClient:
+        client = self.client_class(self._command, self._cwd, worker_id=worker_id)
+        try:
+            await client.start()
+            await client.initialize()
+        except Exception:
+            await client.close()
+            raise
+        self._watch(client)
+        return client
+
+    async def _restart(self, slot: _WorkerSlot) -> None:
+        replacement = self._take_standby()
+        source = "standby" if replacement is not None else "cold start"
+        if replacement is None:
+            try:
+                replacement = await self._spawn(slot.client.worker_id)
+            except Exception as exc:
+                self._restart_failed(slot, exc)
+                return
+        await self._swap(slot, replacement, source).close()
+
+    async def _supervise(self) -> None:
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), SUPERVISE_INTERVAL_SEC)
+            self._wake.clear()
+            if self._stopping:
+                return
+            for slot in self._due_for_restart():
+                await self._restart(slot)
+            if WARM_STANDBY and not self.standby_ready and not self._stopping:
+                try:
+                    self._standby = await self._spawn(-1)
+                except Exception as exc:
+                    _log(f"warm standby spawn failed: {exc}")
+
+    def start_supervisor(self) -> None:
+        self._wake = asyncio.Event()
+        for slot in self._slots:
+            self._watch(slot.client)
+        self._supervisor = asyncio.create_task(self._supervise(), name=f"{BRIDGE_NAME}-supervisor")
+        self._wake.set()
+
+    async def close(self) -> None:
+        self._stopping = True
+        self._wake.set()
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+        if self._standby is not None:
+            await self._standby.close()
+        for slot in self._slots:
+            slot.client.on_exit = None
+            await slot.client.close()
+
+
+def _parse_tool_ttls(spec: str, default_ttl: float) -> dict[str, float]:
+    ttls: dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, ttl = part.strip().partition(":")
+        name = name.strip()
+        if not name:
+            continue
+        ttls[name] = float(ttl) if ttl.strip() else default_ttl
+    return ttls
+
+
+def _canonical_params(params: dict | None) -> str:
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+_CACHE_MISS = object()
+
+
+class ResponseCache:
+    """Size-bounded LRU with per-entry TTL for idempotent MCP calls.
+
+    Only `tools/list` and allowlisted `tools/call` names are cached, keyed by
+    method + canonicalized params; error replies are never stored.
+    """
+
+    def __init__(self, max_entries: int, tools_list_ttl: float, tool_ttls: dict[str, float]):
+        self.max_entries = max(0, max_entries)
+        self._tools_list_ttl = tools_list_ttl
+        self._tool_ttls = tool_ttls
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._per_label: dict[str, list[int]] = {}
+
+    @classmethod
+    def from_env(cls) -> ResponseCache:
+        return cls(CACHE_MAX_ENTRIES, CACHE_TOOLS_LIST_TTL_SEC, _parse_tool_ttls(CACHE_TOOLS, CACHE_TTL_SEC))
+
+    @staticmethod
+    def _label(method: str, params: dict | None) -> str:
+        if method == "tools/call" and isinstance(params, dict):
+            return str(params.get("name", ""))
+        return method
+
+    def policy(self, method: str, params: dict | None) -> tuple[str, float, str] | None:
+        """Return (key, ttl, label) if this call may be served from cache, else None."""
+        if self.max_entries <= 0:
+            return None
+        label = self._label(method, params)
+        if method == "tools/list":
+            ttl = self._tools_list_ttl
+        elif method == "tools/call":
+            ttl = self._tool_ttls.get(label, 0.0)
+        else:
+            return None
+        if ttl <= 0:
+            return None
+        return f"{method}\n{_canonical_params(params)}", ttl, label
+
+    def get(self, key: str, label: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            counters = self._per_label.setdefault(label, [0, 0])
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                counters[1] += 1
+                return _CACHE_MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            counters[0] += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "tools_list_ttl_sec": self._tools_list_ttl,
+                "tool_ttls_sec": dict(self._tool_ttls),
+                "by_tool": {
+                    label: {"hits": counts[0], "misses": counts[1]}
+                    for label, counts in sorted(self._per_label.items())
+                },
+            }
+
+
+class _Flight:
+    __slots__ = ("event", "result", "error", "watchers")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Exception | None = None
+        # One disconnect check per caller sharing the flight (None = cannot tell).
+        self.watchers: list[Callable[[], bool] | None] = []
+
+    def all_gone(self) -> bool:
+        return all(gone is not None and gone() for gone in list(self.watchers))
+
+
+class _LeaderGone(Exception):
+    """The asyncio leader of a coalesced call was cancelled; followers re-issue it."""
+
+
+class SingleFlight:
+    """Coalesce identical in-flight MCP calls onto the first caller's request.
+
+    Later callers with the same method + canonical params wait for the leader
+    and share its result (or error) instead of sending a duplicate request.
+    Threaded callers abandon the shared call only once all of them have gone
+    away; in asyncio mode the leader's call runs inline in its task, so when
+    the leader is cancelled its followers re-issue the call among themselves.
+    """
+
+    def __init__(self, tools: set[str]):
+        self.tools = tools
+        self.enabled = bool(tools)
+        self._lock = threading.Lock()
+        self._flights: dict[str, Any] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self._per_label: dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> SingleFlight:
+        return cls({name.strip() for name in COALESCE_TOOLS.split(",") if name.strip()})
+
+    def _key(self, method: str, params: dict | None) -> tuple[str, str] | None:
+        if not self.enabled:
+            return None
+        label = ResponseCache._label(method, params)
+        if label not in self.tools:
+            return None
+        return f"{method}\n{_canonical_params(params)}", label
+
+    def _join(self, key: str, label: str, new_flight) -> tuple[Any, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                self._per_label[label] = self._per_label.get(label, 0) + 1
+                return flight, False
+            flight = new_flight()
+            self._flights[key] = flight
+            self.leaders += 1
+            return flight, True
+
+    def _leave(self, key: str) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def do(self, method: str, params: dict | None, fn):
+        key = self._key(method, params)
+        if key is None:
+            return fn()
+        flight, leader = self._join(*key, _Flight)
+        flight.watchers.append(_CLIENT_GONE.get())
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        token = _CLIENT_GONE.set(flight.all_gone)
+        try:
+            flight.result = fn()
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            _CLIENT_GONE.reset(token)
+            self._leave(key[0])
+            flight.event.set()
+        return flight.result
+
+    async def do_async(self, method: str, params: dict | None, coro_fn):
+        key = self._key(method, params)
+        if key is None:
+            return await coro_fn()
+        flight, leader = self._join(*key, lambda: asyncio.get_running_loop().create_future())
+        if not leader:
+            try:
+                # shield: a follower giving up must not cancel the leader's call.
+                return await asyncio.shield(flight)
+            except _LeaderGone:
+                return await self.do_async(method, params, coro_fn)
+        try:
+            result = await coro_fn()
+        except BaseException as exc:
+            if not flight.done():
+                if isinstance(exc, asyncio.CancelledError):
+                    flight.set_exception(_LeaderGone())
+                else:
+                    flight.set_exception(exc)
+                # Mark retrieved so an unobserved follower-less error is not logged.
+                flight.exception()
+            raise
+        finally:
+            self._leave(key[0])
+        if not flight.done():
+            flight.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "tools": sorted(self.tools),
+                "in_flight": len(self._flights),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesced_by_tool": dict(sorted(self._per_label.items())),
+            }
+
+
+def _parse_tool_limits(spec: str) -> dict[str, int]:
+    return {name: max(1, int(limit)) for name, limit in _parse_tool_ttls(spec, 1).items()}
+
+
+class _Ticket:
+    __slots__ = ("klass", "labels", "seq", "wake", "granted")
+
+    def __init__(self, klass: str, labels: tuple[str, ...], seq: int, wake: Any) -> None:
+        self.klass = klass
+        self.labels = labels
+        self.seq = seq
+        self.wake = wake
+        self.granted = False
+
+
+class AdmissionControl:
+    """Bounded, prioritized admission of calls to the MCP children.
+
+    A call needs a free slot in the global in-flight limit, in its class
+    limit and in the limit of every tool it touches. Calls that cannot start
+    wait in one queue ordered by class (interactive before long-running), then
+    arrival; a waiter held back only by its own class or tool limit does not
+    block the ones behind it. When a class already has queue_max calls
+    waiting, new ones are shed with 429; a wait longer than the class's queue
+    timeout ends with 503.
+    """
+
+    INTERACTIVE = "interactive"
+    LONG_RUNNING = "long_running"
+    _PRIORITY = {INTERACTIVE: 0, LONG_RUNNING: 1}
+    _RETRY_AFTER_SEC = {INTERACTIVE: 1, LONG_RUNNING: 30}
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        queue_max: int,
+        long_running_tools: set[str],
+        class_limits: dict[str, int],
+        tool_limits: dict[str, int],
+        queue_timeouts: dict[str, float],
+    ):
+        self.max_in_flight = max(0, max_in_flight)
+        self.queue_max = max(0, queue_max)
+        self._long_running_tools = long_running_tools
+        self._class_limits = {klass: limit for klass, limit in class_limits.items() if limit > 0}
+        self._tool_limits = tool_limits
+        self._queue_timeouts = queue_timeouts
+        self._lock = threading.Lock()
+        self._waiting: list[_Ticket] = []
+        self._seq = 0
+        self._in_flight = 0
+        self._by_class = {klass: 0 for klass in self._PRIORITY}
+        self._by_tool: dict[str, int] = {}
+        self.admitted = {klass: 0 for klass in self._PRIORITY}
+        self.queued = {klass: 0 for klass in self._PRIORITY}
+        self.rejected: dict[tuple[str, str], int] = {}
+        self.wait_seconds = {klass: 0.0 for klass in self._PRIORITY}
+
+    @classmethod
+    def from_env(cls) -> AdmissionControl:
+        return cls(
+            MAX_IN_FLIGHT,
+            QUEUE_MAX,
+            {name.strip() for name in LONG_RUNNING_TOOLS.split(",") if name.strip()},
+            {cls.LONG_RUNNING: LONG_RUNNING_MAX_IN_FLIGHT},
+            _parse_tool_limits(TOOL_CONCURRENCY),
+            {cls.INTERACTIVE: QUEUE_TIMEOUT_SEC, cls.LONG_RUNNING: LONG_RUNNING_QUEUE_TIMEOUT_SEC},
+        )
+
+    def classify(self, labels: tuple[str, ...]) -> str:
+        if any(label in self._long_running_tools for label in labels):
+            return self.LONG_RUNNING
+        return self.INTERACTIVE
+
+    def _fits(self, klass: str, labels: tuple[str, ...]) -> bool:
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            return False
+        limit = self._class_limits.get(klass)
+        if limit is not None and self._by_class[klass] >= limit:
+            return False
+        return all(
+            self._by_tool.get(label, 0) < self._tool_limits[label] for label in labels if label in self._tool_limits
+        )
+
+    def _take(self, klass: str, labels: tuple[str, ...]) -> None:
+        self._in_flight += 1
+        self._by_class[klass] += 1
+        self.admitted[klass] += 1
+        for label in labels:
+            self._by_tool[label] = self._by_tool.get(label, 0) + 1
+
+    def _grant_waiters(self) -> None:
+        for ticket in sorted(self._waiting, key=lambda item: (self._PRIORITY[item.klass], item.seq)):
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return
+            if self._fits(ticket.klass, ticket.labels):
+                self._waiting.remove(ticket)
+                self._take(ticket.klass, ticket.labels)
+                ticket.granted = True
+                if isinstance(ticket.wake, threading.Event):
+                    ticket.wake.set()
+                elif not ticket.wake.done():
+                    ticket.wake.set_result(None)
+
+    def _enter(self, klass: str, labels: tuple[str, ...], new_wake) -> _Ticket | None:
+        """Take a slot now (None) or queue a ticket; raise 429 if the class's queue is full."""
+        with self._lock:
+            # Every release re-runs _grant_waiters, so queued tickets are all
+            # blocked; a call that fits now does not overtake anyone.
+            if self._fits(klass, labels):
+                self._take(klass, labels)
+                return None
+            waiting = sum(1 for ticket in self._waiting if ticket.klass == klass)
+            if waiting >= self.queue_max:
+                self._reject(klass, "queue_full")
+                raise BridgeHttpError(
+                    429, f"bridge overloaded: {waiting} {klass} calls queued", self._RETRY_AFTER_SEC[klass]
+                )
+            self._seq += 1
+            ticket = _Ticket(klass, labels, self._seq, new_wake())
+            self._waiting.append(ticket)
+            self.queued[klass] += 1
+            return ticket
+
+    def _waited(self, klass: str, started: float) -> None:
+        with self._lock:
+            self.wait_seconds[klass] += time.monotonic() - started
+
+    def _abandon(self, ticket: _Ticket, reason: str) -> bool:
+        """Drop a waiting ticket; False if it was granted meanwhile (the caller owns the slot)."""
+        with self._lock:
+            if ticket.granted:
+                return False
+            self._waiting.remove(ticket)
+            if reason:
+                self._reject(ticket.klass, reason)
+            # A dropped head-of-line ticket may have held back lower-priority waiters.
+            self._grant_waiters()
+            return True
+
+    def _reject(self, klass: str, reason: str) -> None:
+        key = (klass, reason)
+        self.rejected[key] = self.rejected.get(key, 0) + 1
+
+    def _timeout_error(self, klass: str) -> BridgeHttpError:
+        timeout = self._queue_timeouts[klass]
+        return BridgeHttpError(
+            503, f"bridge overloaded: no {klass} slot within {timeout:g}s", self._RETRY_AFTER_SEC[klass]
+        )
+
+    def _leave(self, klass: str, labels: tuple[str, ...]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._by_class[klass] -= 1
+            for label in labels:
+                remaining = self._by_tool[label] - 1
+                if remaining:
+                    self._by_tool[label] = remaining
+                else:
+                    del self._by_tool[label]
+            self._grant_waiters()
+
+    @staticmethod
+    def _labels(calls: list[tuple[str, dict | None]]) -> tuple[str, ...]:
+        return tuple(sorted({ResponseCache._label(method, params) for method, params in calls}))
+
+    @contextlib.contextmanager
+    def admit(self, calls: list[tuple[str, dict | None]]):
+        labels = self._labels(calls)
+        klass = self.classify(labels)
+        started = time.monotonic()
+        ticket = self._enter(klass, labels, threading.Event)
+        if ticket is not None:
+            granted = _wait_or_gone(ticket.wake, self._queue_timeouts[klass])
+            self._waited(klass, started)
+            if granted is None and self._abandon(ticket, ""):
+                raise ClientDisconnected("HTTP client disconnected while queued for admission")
+            if granted is False and self._abandon(ticket, "timeout"):
+                raise self._timeout_error(klass)
+        try:
+            yield klass
+        finally:
+            self._leave(klass, labels)
+
+    @contextlib.asynccontextmanager
+    async def admit_async(self, calls: list[tuple[str, dict | None]]):
+        labels = self._labels(calls)
+        klass = self.classify(labels)
+        started = time.monotonic()
+        ticket = self._enter(klass, labels, lambda: asyncio.get_running_loop().create_future())
+        if ticket is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.wake), self._queue_timeouts[klass])
+            except asyncio.TimeoutError:
+                if self._abandon(ticket, "timeout"):
+                    raise self._timeout_error(klass) from None
+            except asyncio.CancelledError:
+                # Caller went away while queued; hand back a slot granted in the meantime.
+                if not self._abandon(ticket, ""):
+                    self._leave(klass, labels)
+                raise
+            finally:
+                self._waited(klass, started)
+        try:
+            yield klass
+        finally:
+            self._leave(klass, labels)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_in_flight": self.max_in_flight,
+                "queue_max": self.queue_max,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiting),
+                "classes": {
+                    klass: {
+                        "in_flight": self._by_class[klass],
+                        "waiting": sum(1 for ticket in self._waiting if ticket.klass == klass),
+                        "limit": self._class_limits.get(klass, 0),
+                        "queue_timeout_sec": self._queue_timeouts[klass],
+                        "admitted": self.admitted[klass],
+                        "queued": self.queued[klass],
+                        "wait_seconds": round(self.wait_seconds[klass], 3),
+                    }
+                    for klass in self._PRIORITY
+                },
+                "long_running_tools": sorted(self._long_running_tools),
+                "tool_limits": dict(self._tool_limits),
+                "tools_in_flight": dict(sorted(self._by_tool.items())),
+                "rejected": {f"{klass}:{reason}": count for (klass, reason), count in sorted(self.rejected.items())},
+            }
+
+
+class BridgeHttpError(Exception):
+    def __init__(self, status: int, error: str, retry_after: int | None = None):
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.retry_after = retry_after
+
+
+def _has_raw(payload: Any) -> bool:
+    return isinstance(payload, dict) and any(isinstance(value, RawJson) for value in payload.values())
+
+
+def _json_parts(payload: Any, parts: list) -> None:
+    """Encode payload into `parts`, splicing RawJson values in without re-encoding.
+
+    RawJson only ever sits directly in a response dict or in a batch list of
+    them, so everything else goes through a single json.dumps call.
+    """
+    if isinstance(payload, RawJson):
+        parts.append(payload.view())
+    elif _has_raw(payload):
+        parts.append(b"{")
+        for index, (key, value) in enumerate(payload.items()):
+            if index:
+                parts.append(b",")
+            parts.append(_json_dumps_bytes(str(key)) + b":")
+            _json_parts(value, parts)
+        parts.append(b"}")
+    elif isinstance(payload, list) and any(_has_raw(item) for item in payload):
+        parts.append(b"[")
+        for index, item in enumerate(payload):
+            if index:
+                parts.append(b",")
+            _json_parts(item, parts)
+        parts.append(b"]")
+    else:
+        parts.append(_json_dumps_bytes(payload))
+
+
+def _encode_json(payload: dict | list) -> bytes:
+    started = time.perf_counter()
+    parts: list = []
+    _json_parts(payload, parts)
+    # A bare RawJson payload (e.g. a passed-through initialize result) is a memoryview.
+    body = parts[0] if len(parts) == 1 and isinstance(parts[0], bytes) else b"".join(parts)
+    METRICS.observe_json("encode", "http", time.perf_counter() - started)
+    return body
+
+
+def _gzip_compressor(level: int):
+    codec = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return codec.compress, codec.flush
+
+
+def _zstd_compressor(level: int):
+    codec = zstandard.ZstdCompressor(level=level).compressobj()
+    return codec.compress, codec.flush
+
+
+def _brotli_compressor(level: int):
+    codec = brotli.Compressor(quality=level)
+    return codec.process, codec.finish
+
+
+# name -> (streaming compressor factory, default level); only installed codecs.
+_CODECS = {"gzip": (_gzip_compressor, 3)}
+if zstandard is not None:
+    _CODECS["zstd"] = (_zstd_compressor, 3)
+if brotli is not None:
+    _CODECS["br"] = (_brotli_compressor, 4)
+
+
+def _compression_codecs(spec: str) -> dict[str, int]:
+    """Configured and installed codecs in preference order, with their level."""
+    codecs: dict[str, int] = {}
+    for name, level in _parse_tool_ttls(spec, -1).items():
+        if name not in _CODECS:
+            _log(f"compression encoding not available, skipped: {name}")
+            continue
+        codecs[name] = int(level) if level >= 0 else _CODECS[name][1]
+    return codecs
+
+
+COMPRESSION = _compression_codecs(COMPRESS_ENCODINGS) if COMPRESS_MIN_BYTES > 0 else {}
+# asyncio mode compresses bodies from this size on in a worker thread (the codecs release the GIL).
+_COMPRESS_OFFLOAD_BYTES = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _negotiate_encoding(accept_encoding: str) -> str | None:
+    """Codec with the highest client q-value (ties: COMPRESSION order), else None."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip()] = quality
+    best, best_quality = None, 0.0
+    for encoding in COMPRESSION:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _response_parts(payload: dict | list, accept_encoding: str) -> tuple[list, int, str | None]:
+    """Encoded body parts, their total size and the Content-Encoding to apply (or None)."""
+    started = time.perf_counter()
+    parts: list = []
+    _json_parts(payload, parts)
+    METRICS.observe_json("encode", "http", time.perf_counter() - started)
+    size = sum(len(part) for part in parts)
+    if not accept_encoding or not COMPRESSION or size < COMPRESS_MIN_BYTES:
+        return parts, size, None
+    return parts, size, _negotiate_encoding(accept_encoding)
+
+
+def _response_body(parts: list, size: int, encoding: str | None) -> tuple[bytes, list[tuple[str, str]]]:
+    """Join the parts, or feed them one by one (RawJson slices included) through a
+    streaming compressor so the uncompressed body is never held as one buffer."""
+    if encoding is None:
+        return (parts[0] if len(parts) == 1 else b"".join(parts)), []
+    started = time.perf_counter()
+    compress, finish = _CODECS[encoding][0](COMPRESSION[encoding])
+    chunks = [compress(part) for part in parts]
+    chunks.append(finish())
+    body = b"".join(chunks)
+    METRICS.observe_compression(encoding, size, len(body), time.perf_counter() - started)
+    return body, [("Content-Encoding", encoding), ("Vary", "Accept-Encoding")]
+
+
+def _decode_json_body(raw: bytes) -> Any:
+    if not raw:
+        return {}
+    return _loads_timed(raw.decode("utf-8"), "http")
+
+
+def _chunk_size(line: bytes) -> int:
+    size = line.split(b";", 1)[0].strip()
+    if not size:
+        raise ValueError("malformed chunk size")
+    return int(size, 16)
+
+
+def _read_chunked(rfile: io.BufferedIOBase) -> bytes:
+    """Read a `Transfer-Encoding: chunked` request body, leaving the stream at the next request."""
+    chunks = []
+    while True:
+        size = _chunk_size(rfile.readline(65537))
+        if size == 0:
+            while rfile.readline(65537) not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+            return b"".join(chunks)
+        chunks.append(rfile.read(size))
+        rfile.readline()
+
+
+async def _read_chunked_async(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = _chunk_size(await reader.readline())
+        if size == 0:
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
                 pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+def _health_response(client: McpWorkerPool, flights: SingleFlight, http: dict) -> tuple[int, dict]:
+    workers = client.stats()
+    alive = any(worker["alive"] for worker in workers)
+    return 200 if alive else 503, {
+        "ok": alive,
+        "bridge": BRIDGE_NAME,
+        "initialized": True,
+        "pool_size": len(workers),
+        "healthy_workers": sum(1 for worker in workers if worker["healthy"]),
+        "workers": workers,
+        "warm_standby": client.standby_ready,
+        "coalescing": flights.stats(),
+        "admission": client.admission.stats(),
+        "http": http,
+    }
+
+
+_ENDPOINTS = (
+    "/health",
+    "/metrics",
+    "/tools",
+    "/tools/call",
+    "/tool/<name>",
+    "/rpc",
+    "/rpc/batch",
+    "/cache",
+    "/tools/call/stream",
+    "/tool/<name>/stream",
+    "/rpc/stream",
+)
+_ROUTES = frozenset(_ENDPOINTS) | {"/", "/cache/clear"}
+_METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _index_payload() -> dict:
+    return {"ok": True, "bridge": BRIDGE_NAME, "endpoints": list(_ENDPOINTS)}
+
+
+def _metrics_text(client: McpWorkerPool, cache: ResponseCache, flights: SingleFlight, http: dict) -> bytes:
+    """Prometheus text exposition: event counters from METRICS plus live gauges."""
+    lines = METRICS.render()
+    workers = client.stats()
+
+    def gauge(name: str, help_text: str, kind: str = "gauge") -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    gauge("mcp_bridge_in_flight_requests", "Requests dispatched to a worker and not yet answered.")
+    lines.append(f"mcp_bridge_in_flight_requests {sum(worker['outstanding'] for worker in workers)}")
+    gauge("mcp_bridge_worker_outstanding", "In-flight requests per worker.")
+    for worker in workers:
+        lines.append(f"mcp_bridge_worker_outstanding{_prom_labels(worker=worker['id'])} {worker['outstanding']}")
+    gauge("mcp_bridge_worker_healthy", "1 if the worker is alive and below the failure threshold.")
+    for worker in workers:
+        lines.append(f"mcp_bridge_worker_healthy{_prom_labels(worker=worker['id'])} {int(worker['healthy'])}")
+    gauge("mcp_bridge_worker_restarts_total", "Times the worker slot got a new child process.", "counter")
+    for worker in workers:
+        lines.append(f"mcp_bridge_worker_restarts_total{_prom_labels(worker=worker['id'])} {worker['restarts']}")
+    gauge("mcp_bridge_child_resident_memory_bytes", "Resident set size of each MCP child process.")
+    for worker in workers:
+        rss = _rss_bytes(worker["pid"])
+        if rss is not None:
+            lines.append(f"mcp_bridge_child_resident_memory_bytes{_prom_labels(worker=worker['id'])} {rss}")
+    gauge("mcp_bridge_warm_standby", "1 if an initialized spare child is ready.")
+    lines.append(f"mcp_bridge_warm_standby {int(client.standby_ready)}")
+
+    cache_stats = cache.stats()
+    gauge("mcp_bridge_cache_entries", "Entries held by the response cache.")
+    lines.append(f"mcp_bridge_cache_entries {cache_stats['entries']}")
+    for key in ("hits", "misses", "evictions", "expirations"):
+        gauge(f"mcp_bridge_cache_{key}_total", f"Response cache {key}.", "counter")
+        lines.append(f"mcp_bridge_cache_{key}_total {cache_stats[key]}")
+
+    admission = client.admission.stats()
+    gauge("mcp_bridge_admission_in_flight", "Admitted calls per priority class.")
+    for klass, counts in admission["classes"].items():
+        lines.append(f"mcp_bridge_admission_in_flight{_prom_labels(priority=klass)} {counts['in_flight']}")
+    gauge("mcp_bridge_admission_waiting", "Calls queued for an admission slot per priority class.")
+    for klass, counts in admission["classes"].items():
+        lines.append(f"mcp_bridge_admission_waiting{_prom_labels(priority=klass)} {counts['waiting']}")
+    gauge("mcp_bridge_admission_wait_seconds_total", "Time calls spent queued for admission.", "counter")
+    for klass, counts in admission["classes"].items():
+        lines.append(f"mcp_bridge_admission_wait_seconds_total{_prom_labels(priority=klass)} {counts['wait_seconds']}")
+    gauge("mcp_bridge_admission_rejected_total", "Calls shed by admission control (queue_full=429, timeout=503).", "counter")
+    for key, count in admission["rejected"].items():
+        klass, reason = key.split(":", 1)
+        lines.append(f"mcp_bridge_admission_rejected_total{_prom_labels(priority=klass, reason=reason)} {count}")
+
+    flight_stats = flights.stats()
+    gauge("mcp_bridge_coalesced_total", "Calls answered by joining an identical in-flight request.", "counter")
+    lines.append(f"mcp_bridge_coalesced_total {flight_stats['coalesced']}")
+
+    gauge("mcp_bridge_http_open_connections", "Client connections currently held by the HTTP front end.")
+    lines.append(f"mcp_bridge_http_open_connections {http['open_connections']}")
+    if "threads" in http:
+        gauge("mcp_bridge_http_threads", "Size of the threaded front end's connection pool.")
+        lines.append(f"mcp_bridge_http_threads {http['threads']}")
+        gauge("mcp_bridge_http_queued_connections", "Accepted connections waiting for a pool thread.")
+        lines.append(f"mcp_bridge_http_queued_connections {http['queued_connections']}")
+
+    gauge("mcp_bridge_json_backend", "JSON library in use (orjson, msgspec or json).")
+    lines.append(f"mcp_bridge_json_backend{_prom_labels(backend=JSON_BACKEND)} 1")
+
+    rss = _rss_bytes("self")
+    if rss is not None:
+        gauge("process_resident_memory_bytes", "Resident set size of the bridge process.")
+        lines.append(f"process_resident_memory_bytes {rss}")
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _rpc_for_post(path: str, payload: Any) -> tuple[str, dict]:
+    """Map a POST route + JSON body to the (method, params) sent to the MCP child."""
+    body = payload if isinstance(payload, dict) else {}
+    if path == "/tools/call":
+        tool_name = str(body.get("name", "")).strip()
+        if not tool_name:
+            raise BridgeHttpError(400, "missing_tool_name")
+        return "tools/call", {"name": tool_name, "arguments": body.get("arguments") or {}}
+
+    if path.startswith("/tool/"):
+        tool_name = unquote(path[len("/tool/") :]).strip()
+        if not tool_name:
+            raise BridgeHttpError(400, "missing_tool_name")
+        return "tools/call", {"name": tool_name, "arguments": body}
+
+    if path == "/rpc":
+        method = str(body.get("method", "")).strip()
+        params = body.get("params") if isinstance(body.get("params"), dict) else {}
+        if not method:
+            raise BridgeHttpError(400, "missing_method")
+        return method, params
+
+    raise BridgeHttpError(404, "not_found")
+
+
+def _rpc_error(exc: Exception) -> dict:
+    """JSON-RPC error object for one failed batch item."""
+    if isinstance(exc, McpRemoteError) and isinstance(exc.error, dict):
+        return exc.error
+    status, payload = _error_response(exc)
+    return {"code": -32603 if status < 500 else -32000, "message": payload["error"], "data": {"status": status}}
+
+
+class _BatchPlan:
+    """Validated JSON-RPC batch: cache hits and invalid items are answered up front,
+    the remaining calls go to one worker in a single stdin write."""
+
+    def __init__(self, payload: Any, cache: ResponseCache):
+        if not isinstance(payload, list) or not payload:
+            raise BridgeHttpError(400, "batch_must_be_non_empty_array")
+        if len(payload) > BATCH_MAX_ITEMS:
+            raise BridgeHttpError(400, "batch_too_large")
+        self._cache = cache
+        self._responses: list[dict | None] = [None] * len(payload)
+        self._pending: list[tuple[int, object, tuple[str, float, str] | None]] = []
+        self.calls: list[tuple[str, dict | None]] = []
+        self.notifications: list[tuple[str, dict | None]] = []
+
+        for index, item in enumerate(payload):
+            method = item.get("method") if isinstance(item, dict) else None
+            if not isinstance(method, str) or not method.strip():
+                item_id = item.get("id") if isinstance(item, dict) else None
+                self._responses[index] = {
+                    "jsonrpc": "2.0",
+                    "id": item_id,
+                    "error": {"code": -32600, "message": "Invalid Request"},
+                }
+                continue
+            method = method.strip()
+            params = item.get("params") if isinstance(item.get("params"), dict) else {}
+            if "id" not in item:
+                self.notifications.append((method, params))
+                continue
+            policy = cache.policy(method, params)
+            if policy is not None:
+                cached = cache.get(policy[0], policy[2])
+                if cached is not _CACHE_MISS:
+                    self._responses[index] = {"jsonrpc": "2.0", "id": item["id"], "result": cached}
+                    continue
+            self._pending.append((index, item["id"], policy))
+            self.calls.append((method, params))
+
+    def responses(self, results: list[tuple[Any, Exception | None]]) -> list[dict]:
+        for (index, item_id, policy), (result, error) in zip(self._pending, results):
+            if error is None:
+                if policy is not None:
+                    self._cache.put(policy[0], result, policy[1])
+                self._responses[index] = {"jsonrpc": "2.0", "id": item_id, "result": result}
+            else:
+                self._responses[index] = {"jsonrpc": "2.0", "id": item_id, "error": _rpc_error(error)}
+        return [response for response in self._responses if response is not None]
+
+
+_STREAM_SUFFIX = "/stream"
+_SSE_CHUNK_BYTES = 64 * 1024
+_SSE_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_SSE_HEADERS = (
+    ("Content-Type", "text/event-stream; charset=utf-8"),
+    ("Cache-Control", "no-store"),
+    ("X-Accel-Buffering", "no"),
+)
 
 
-def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict):
-    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+def _iter_sse_event(event: str, data: Any):
+    """Encode one SSE event in bounded chunks so large results are never joined in full."""
+    pending = [f"event: {event}\ndata: "]
+    size = 0
+    for piece in _SSE_ENCODER.iterencode(data):
+        pending.append(piece)
+        size += len(piece)
+        if size >= _SSE_CHUNK_BYTES:
+            yield "".join(pending).encode("utf-8")
+            pending = []
+            size = 0
+    pending.append("\n\n")
+    yield "".join(pending).encode("utf-8")
+
+
+def _iter_sse_raw_result(result: RawJson):
+    yield b'event: result\ndata: {"ok":true,"result":'
+    view = result.view()
+    for offset in range(0, len(view), _SSE_CHUNK_BYTES):
+        yield view[offset : offset + _SSE_CHUNK_BYTES]
+    yield b"}\n\n"
+
+
+def _sse_items(kind: str, data: Any):
+    if kind == "keepalive":
+        return (b": keepalive\n\n",)
+    if kind == "result":
+        if isinstance(data, RawJson):
+            # An SSE data line must not contain a raw newline (possible with
+            # pretty-printed Content-Length frames); re-encode those.
+            if data.data.find(b"\n", data.start, data.end) < 0:
+                return _iter_sse_raw_result(data)
+            data = data.decode()
+        return _iter_sse_event("result", {"ok": True, "result": data})
+    return _iter_sse_event(kind, data)
+
+
+def _sse_error(exc: Exception) -> bytes:
+    status, payload = _error_response(exc)
+    payload["status"] = status
+    return b"".join(_iter_sse_event("error", payload))
+
+
+def _error_response(exc: Exception) -> tuple[int, dict]:
+    if isinstance(exc, BridgeHttpError):
+        if exc.retry_after is not None:
+            return exc.status, {"ok": False, "error": exc.error, "retry_after_sec": exc.retry_after}
+        return exc.status, {"ok": False, "error": exc.error}
+    if isinstance(exc, TimeoutError):
+        return 504, {"ok": False, "error": str(exc)}
+    # Keep bridge failure explicit for operator visibility.
+    return 502, {"ok": False, "error": str(exc)}
+
+
+def _retry_after(payload: dict | list) -> list[tuple[str, str]]:
+    if isinstance(payload, dict) and "retry_after_sec" in payload:
+        return [("Retry-After", str(payload["retry_after_sec"]))]
+    return []
+
+
+def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict | list):
+    body, encoding = _response_body(*_response_parts(payload, handler.headers.get("Accept-Encoding", "")))
+    _bytes_response(handler, status, body, "application/json; charset=utf-8", _retry_after(payload) + encoding)
+
+
+def _bytes_response(
+    handler: BaseHTTPRequestHandler,
+    status: int,
+    body: bytes,
+    content_type: str,
+    headers: list[tuple[str, str]] = (),
+):
     handler.send_response(status)
-    handler.send_header("Content-Type", "application/json; charset=utf-8")
+    handler.send_header("Content-Type", content_type)
     handler.send_header("Cache-Control", "no-store")
+    for name, value in headers:
+        handler.send_header(name, value)
     handler.send_header("Content-Length", str(len(body)))
     handler.end_headers()
     handler.wfile.write(body)
 
 
-def make_handler(client: StdioMcpClient):
+_IDLE_POLL_SEC = 0.5
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer whose connections are served by a fixed set of threads.
+
+    Accepted connections beyond the pool wait in a queue. While all threads
+    are taken, a keep-alive connection that stays idle for _IDLE_POLL_SEC
+    gives its thread back, so the pool bounds threads without starving new
+    clients.
+    """
+
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, server_address: tuple[str, int], handler_class: type, threads: int):
+        # Set before binding: socketserver calls server_close() when the bind fails.
+        self.draining = False
+        self._connections: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._busy = 0
+        self._threads: list[threading.Thread] = []
+        super().__init__(server_address, handler_class)
+        self._threads = [
+            threading.Thread(target=self._serve_connections, name=f"http-{index}", daemon=True)
+            for index in range(threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def process_request(self, request, client_address) -> None:
+        METRICS.count_http_connection()
+        with self._lock:
+            self._queued += 1
+        self._connections.put((request, client_address))
+
+    def _serve_connections(self) -> None:
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            with self._lock:
+                self._queued -= 1
+                self._busy += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._lock:
+                    self._busy -= 1
+
+    @property
+    def starved(self) -> bool:
+        """Connections are waiting and every thread is taken (a momentary queue is not starvation)."""
+        return self._queued > len(self._threads) - self._busy
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "open_connections": self._busy,
+                "queued_connections": self._queued,
+                "threads": len(self._threads),
+                "keepalive_timeout_sec": KEEPALIVE_TIMEOUT_SEC,
+            }
+
+    def server_close(self) -> None:
+        self.draining = True
+        super().server_close()
+        for _ in self._threads:
+            self._connections.put(None)
+
+
+def make_handler(client: McpWorkerPool, cache: ResponseCache, flights: SingleFlight):
     class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" if KEEPALIVE_TIMEOUT_SEC > 0 else "HTTP/1.0"
+        # Headers and body go out as separate writes; without TCP_NODELAY the
+        # body waits for the client's delayed ACK (~40 ms per response).
+        disable_nagle_algorithm = True
+        _served = 0
+
+        def handle(self):
+            if KEEPALIVE_TIMEOUT_SEC <= 0:
+                return super().handle()
+            while self._wait_for_request():
+                self.handle_one_request()
+                self._served += 1
+                if self.close_connection:
+                    return
+
+        def _buffered(self) -> bytes:
+            """Bytes already readable without blocking (b"" if none or the peer closed)."""
+            self.connection.setblocking(False)
+            try:
+                return self.rfile.peek(1)
+            except OSError:
+                return b""
+            finally:
+                self.connection.settimeout(self.timeout)
+
+        def _wait_for_request(self) -> bool:
+            deadline = time.monotonic() + KEEPALIVE_TIMEOUT_SEC
+            while True:
+                if self._buffered():
+                    return True
+                if self._served and self.server.draining:
+                    return False
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                readable, _, _ = select.select([self.connection], [], [], min(remaining, _IDLE_POLL_SEC))
+                if readable:
+                    return bool(self._buffered())
+                # Only yield to waiting connections after a full poll interval of
+                # silence; chatty clients keep their connection.
+                if self._served and self.server.starved:
+                    return False
+
+        def _client_gone(self) -> bool:
+            """True once the peer closed or reset the connection; pipelined bytes do not count.
+
+            Peeks with select/MSG_PEEK only, so it is safe to call from the
+            thread of a coalesced call's leader.
+            """
+            try:
+                readable, _, _ = select.select([self.connection], [], [], 0)
+                return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+            except (OSError, ValueError):
+                return True
+
+        def handle_one_request(self):
+            token = _CLIENT_GONE.set(self._client_gone)
+            try:
+                super().handle_one_request()
+            except (BrokenPipeError, ConnectionResetError):
+                # The response could not be delivered: the caller left after its call finished.
+                self.close_connection = True
+            finally:
+                _CLIENT_GONE.reset(token)
+
+        def _client_went_away(self) -> None:
+            # 499 as in nginx: client closed the request before the response.
+            self.close_connection = True
+            self.log_request(499)
+
+        def end_headers(self):
+            if KEEPALIVE_TIMEOUT_SEC > 0 and not self.close_connection:
+                if (
+                    self._served + 1 >= KEEPALIVE_MAX_REQUESTS
+                    or self.server.starved
+                    or self.server.draining
+                ):
+                    self.send_header("Connection", "close")
+                else:
+                    self.send_header("Keep-Alive", f"timeout={int(KEEPALIVE_TIMEOUT_SEC)}")
+            super().end_headers()
+
         def log_message(self, format: str, *args):
             _log(f"http: {self.address_string()} {format % args}")
 
-        def _read_json(self) -> dict:
+        def log_request(self, code="-", size="-"):
+            if isinstance(code, int):
+                METRICS.count_http(self.command, urlparse(self.path).path, code)
+            super().log_request(code, size)
+
+        def _call(self, method: str, params: dict):
+            policy = cache.policy(method, params)
+            if policy is not None:
+                cached = cache.get(policy[0], policy[2])
+                if cached is not _CACHE_MISS:
+                    return cached
+            result = flights.do(method, params, lambda: client.request(method, params))
+            if policy is not None:
+                cache.put(policy[0], result, policy[1])
+            return result
+
+        def _stream(self, method: str, params: dict) -> None:
+            # Streaming bypasses cache and coalescing: progress belongs to one caller.
+            self.send_response(200)
+            for name, value in _SSE_HEADERS:
+                self.send_header(name, value)
+            # The stream ends when the connection does.
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                self.wfile.write(b": stream opened\n\n")
+                with contextlib.closing(client.stream(method, params)) as events:
+                    try:
+                        for kind, data in events:
+                            for chunk in _sse_items(kind, data):
+                                self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        raise
+                    except Exception as exc:
+                        self.wfile.write(_sse_error(exc))
+            except (BrokenPipeError, ConnectionResetError):
+                _log(f"http: {self.address_string()} stream client went away ({method})")
+
+        def _read_body(self) -> bytes:
+            # Always drain the body, even if it turns out invalid: on a persistent
+            # connection leftover bytes would be parsed as the next request.
+            if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+                return _read_chunked(self.rfile)
             content_length = int(self.headers.get("Content-Length", "0"))
-            if content_length <= 0:
-                return {}
-            raw = self.rfile.read(content_length)
-            if not raw:
-                return {}
-            return json.loads(raw.decode("utf-8"))
+            return self.rfile.read(content_length) if content_length > 0 else b""
 
         def do_GET(self):  # noqa: N802
             parsed = urlparse(self.path)
             if parsed.path == "/health":
-                return _json_response(
-                    self,
-                    200 if client.is_alive() else 503,
-                    {
-                        "ok": client.is_alive(),
-                        "bridge": BRIDGE_NAME,
-                        "initialized": True,
-                    },
-                )
+                return _json_response(self, *_health_response(client, flights, self.server.stats()))
+
+            if parsed.path == "/metrics":
+                metrics = _metrics_text(client, cache, flights, self.server.stats())
+                return _bytes_response(self, 200, metrics, _METRICS_CONTENT_TYPE)
 
             if parsed.path == "/tools":
                 try:
-                    tools = client.request("tools/list", {})
-                    return _json_response(self, 200, {"ok": True, "result": tools})
+                    tools = self._call("tools/list", {})
+                except ClientDisconnected:
+                    return self._client_went_away()
                 except Exception as exc:
                     return _json_response(self, 502, {"ok": False, "error": str(exc)})
+                return _json_response(self, 200, {"ok": True, "result": tools})
+
+            if parsed.path == "/cache":
+                return _json_response(self, 200, {"ok": True, "cache": cache.stats()})
 
             if parsed.path == "/":
-                return _json_response(
-                    self,
-                    200,
-                    {
-                        "ok": True,
-                        "bridge": BRIDGE_NAME,
-                        "endpoints": ["/health", "/tools", "/tools/call", "/tool/<name>", "/rpc"],
-                    },
-                )
+                return _json_response(self, 200, _index_payload())
 
             return _json_response(self, 404, {"ok": False, "error": "not_found"})
 
         def do_POST(self):  # noqa: N802
             parsed = urlparse(self.path)
             try:
-                payload = self._read_json()
+                body = self._read_body()
+            except (ValueError, OSError):
+                self.close_connection = True
+                return _json_response(self, 400, {"ok": False, "error": "bad_request"})
+            try:
+                payload = _decode_json_body(body)
             except Exception:
                 return _json_response(self, 400, {"ok": False, "error": "invalid_json"})
 
+            if parsed.path == "/cache/clear":
+                return _json_response(self, 200, {"ok": True, "cleared": cache.clear()})
+
+            if parsed.path == "/rpc/batch":
+                try:
+                    plan = _BatchPlan(payload, cache)
+                except BridgeHttpError as exc:
+                    return _json_response(self, *_error_response(exc))
+                try:
+                    results = client.request_batch(plan.calls, plan.notifications)
+                except ClientDisconnected:
+                    return self._client_went_away()
+                return _json_response(self, 200, plan.responses(results))
+
+            if parsed.path.endswith(_STREAM_SUFFIX):
+                try:
+                    method, params = _rpc_for_post(parsed.path[: -len(_STREAM_SUFFIX)], payload)
+                except BridgeHttpError as exc:
+                    return _json_response(self, *_error_response(exc))
+                return self._stream(method, params)
+
             try:
-                if parsed.path == "/tools/call":
-                    tool_name = str(payload.get("name", "")).strip()
-                    arguments = payload.get("arguments") or {}
-                    if not tool_name:
-                        return _json_response(self, 400, {"ok": False, "error": "missing_tool_name"})
-                    result = client.request("tools/call", {"name": tool_name, "arguments": arguments})
-                    return _json_response(self, 200, {"ok": True, "result": result})
-
-                if parsed.path.startswith("/tool/"):
-                    tool_name = unquote(parsed.path[len("/tool/") :]).strip()
-                    arguments = payload if isinstance(payload, dict) else {}
-                    if not tool_name:
-                        return _json_response(self, 400, {"ok": False, "error": "missing_tool_name"})
-                    result = client.request("tools/call", {"name": tool_name, "arguments": arguments})
-                    return _json_response(self, 200, {"ok": True, "result": result})
-
-                if parsed.path == "/rpc":
-                    method = str(payload.get("method", "")).strip()
-                    params = payload.get("params") if isinstance(payload.get("params"), dict) else {}
-                    if not method:
-                        return _json_response(self, 400, {"ok": False, "error": "missing_method"})
-                    result = client.request(method, params)
-                    return _json_response(self, 200, {"ok": True, "result": result})
-
-                return _json_response(self, 404, {"ok": False, "error": "not_found"})
-            except TimeoutError as exc:
-                return _json_response(self, 504, {"ok": False, "error": str(exc)})
-            except Exception as exc:  # Keep bridge failure explicit for operator visibility.
-                return _json_response(self, 502, {"ok": False, "error": str(exc)})
+                method, params = _rpc_for_post(parsed.path, payload)
+                result = self._call(method, params)
+            except ClientDisconnected:
+                return self._client_went_away()
+            except Exception as exc:
+                return _json_response(self, *_error_response(exc))
+            return _json_response(self, 200, {"ok": True, "result": result})
 
     return Handler
 
 
+def _connection_header(keep_alive: bool) -> str:
+    if keep_alive:
+        return f"Connection: keep-alive\r\nKeep-Alive: timeout={int(KEEPALIVE_TIMEOUT_SEC)}\r\n"
+    return "Connection: close\r\n"
+
+
+class AsyncBridgeServer:
+    """Minimal HTTP/1.1 front end on asyncio streams with persistent connections."""
+
+    def __init__(self, client: AsyncMcpWorkerPool, cache: ResponseCache, flights: SingleFlight):
+        self._client = client
+        self._cache = cache
+        self._flights = flights
+        self._open_connections = 0
+        self.draining = False
+
+    def http_stats(self) -> dict:
+        return {"open_connections": self._open_connections, "keepalive_timeout_sec": KEEPALIVE_TIMEOUT_SEC}
+
+    async def _call(self, method: str, params: dict):
+        policy = self._cache.policy(method, params)
+        if policy is not None:
+            cached = self._cache.get(policy[0], policy[2])
+            if cached is not _CACHE_MISS:
+                return cached
+        result = await self._flights.do_async(method, params, lambda: self._client.request(method, params))
+        if policy is not None:
+            self._cache.put(policy[0], result, policy[1])
+        return result
+
+    async def _until_disconnect(self, reader: asyncio.StreamReader, work) -> Any:
+        """Await `work`, cancelling it once the client closes its end of the connection.
+
+        A timer re-armed every DISCONNECT_POLL_SEC checks the reader for EOF;
+        EOF only shows after pipelined bytes were consumed, so a client with a
+        queued next request is never mistaken for a gone one.
+        """
+        if DISCONNECT_POLL_SEC <= 0:
+            return await work
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        gone = False
+
+        def check() -> None:
+            nonlocal gone, timer
+            if reader.at_eof() or reader.exception() is not None:
+                gone = True
+                task.cancel()
+            else:
+                timer = loop.call_later(DISCONNECT_POLL_SEC, check)
+
+        timer = loop.call_later(DISCONNECT_POLL_SEC, check)
+        try:
+            return await work
+        except asyncio.CancelledError:
+            if gone:
+                raise ClientDisconnected("HTTP client disconnected") from None
+            raise
+        finally:
+            timer.cancel()
+            if gone:
+                task.uncancel()
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple[int, dict | list]:
+        path = urlparse(target).path
+        if method == "GET":
+            if path == "/health":
+                return _health_response(self._client, self._flights, self.http_stats())
+            if path == "/tools":
+                try:
+                    tools = await self._call("tools/list", {})
+                    return 200, {"ok": True, "result": tools}
+                except Exception as exc:
+                    return 502, {"ok": False, "error": str(exc)}
+            if path == "/cache":
+                return 200, {"ok": True, "cache": self._cache.stats()}
+            if path == "/":
+                return 200, _index_payload()
+            return 404, {"ok": False, "error": "not_found"}
+
+        if method == "POST":
+            try:
+                payload = _decode_json_body(body)
+            except Exception:
+                return 400, {"ok": False, "error": "invalid_json"}
+            if path == "/cache/clear":
+                return 200, {"ok": True, "cleared": self._cache.clear()}
+            if path == "/rpc/batch":
+                try:
+                    plan = _BatchPlan(payload, self._cache)
+                except BridgeHttpError as exc:
+                    return _error_response(exc)
+                results = await self._client.request_batch(plan.calls, plan.notifications)
+                return 200, plan.responses(results)
+            try:
+                rpc_method, params = _rpc_for_post(path, payload)
+                result = await self._call(rpc_method, params)
+                return 200, {"ok": True, "result": result}
+            except Exception as exc:
+                return _error_response(exc)
+
+        return 501, {"ok": False, "error": "unsupported_method"}
+
+    async def _stream(self, writer: asyncio.StreamWriter, path: str, body: bytes) -> int:
+        try:
+            rpc_method, params = _rpc_for_post(path, _decode_json_body(body))
+        except BridgeHttpError as exc:
+            status, payload = _error_response(exc)
+            await self._send(writer, status, payload, keep_alive=False)
+            return status
+        except Exception:
+            await self._send(writer, 400, {"ok": False, "error": "invalid_json"}, keep_alive=False)
+            return 400
+
+        head = "HTTP/1.1 200 OK\r\n" + "".join(f"{name}: {value}\r\n" for name, value in _SSE_HEADERS)
+        writer.write((head + "Connection: close\r\n\r\n: stream opened\n\n").encode("latin-1"))
+        await writer.drain()
+        events = self._client.stream(rpc_method, params)
+        try:
+            async for kind, data in events:
+                for chunk in _sse_items(kind, data):
+                    writer.write(chunk)
+                    await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as exc:
+            writer.write(_sse_error(exc))
+            await writer.drain()
+        finally:
+            await events.aclose()
+        return 200
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict | list,
+        keep_alive: bool,
+        accept_encoding: str = "",
+    ) -> None:
+        parts, size, encoding = _response_parts(payload, accept_encoding)
+        if encoding is not None and size >= _COMPRESS_OFFLOAD_BYTES:
+            body, headers = await asyncio.to_thread(_response_body, parts, size, encoding)
+        else:
+            body, headers = _response_body(parts, size, encoding)
+        await self._send_bytes(
+            writer, status, body, "application/json; charset=utf-8", keep_alive, _retry_after(payload) + headers
+        )
+
+    async def _send_bytes(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        content_type: str,
+        keep_alive: bool,
+        headers: list[tuple[str, str]] = (),
+    ) -> None:
+        reason = HTTPStatus(status).phrase
+        extra = "".join(f"{name}: {value}\r\n" for name, value in headers)
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            "Cache-Control: no-store\r\n"
+            f"{extra}"
+            f"Content-Length: {len(body)}\r\n"
+            f"{_connection_header(keep_alive)}"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _read_request_line(self, reader: asyncio.StreamReader, served: int) -> bytes:
+        """Next request line; b"" on EOF or when an idle keep-alive connection times out."""
+        # HTTP/1.0 mode keeps the old behaviour of waiting for the first request indefinitely.
+        timeout = KEEPALIVE_TIMEOUT_SEC if KEEPALIVE_TIMEOUT_SEC > 0 else None
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                return b""
+            # Tolerate the stray CRLF some clients send after a request body.
+            if line not in (b"\r\n", b"\n") or not served:
+                return line
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername")
+        host = peer[0] if isinstance(peer, tuple) else str(peer)
+        METRICS.count_http_connection()
+        self._open_connections += 1
+        served = 0
+        try:
+            while not (served and self.draining):
+                request_line = (await self._read_request_line(reader, served)).decode("latin-1").rstrip("\r\n")
+                if not request_line:
+                    return
+                parts = request_line.split()
+                headers: dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                if len(parts) != 3:
+                    await self._send(writer, 400, {"ok": False, "error": "bad_request"}, keep_alive=False)
+                    _log(f'http: {host} "{request_line}" 400 -')
+                    return
+
+                served += 1
+                keep_alive = (
+                    KEEPALIVE_TIMEOUT_SEC > 0
+                    and parts[2] == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                    and served < KEEPALIVE_MAX_REQUESTS
+                    and not self.draining
+                )
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    body = await _read_chunked_async(reader)
+                else:
+                    content_length = int(headers.get("content-length", "0") or "0")
+                    body = await reader.readexactly(content_length) if content_length > 0 else b""
+                method = parts[0].upper()
+                path = urlparse(parts[1]).path
+                if method == "POST" and path.endswith(_STREAM_SUFFIX):
+                    # The stream ends when the connection does.
+                    keep_alive = False
+                    status = await self._stream(writer, path[: -len(_STREAM_SUFFIX)], body)
+                elif method == "GET" and path == "/metrics":
+                    status = 200
+                    metrics = _metrics_text(self._client, self._cache, self._flights, self.http_stats())
+                    await self._send_bytes(writer, status, metrics, _METRICS_CONTENT_TYPE, keep_alive)
+                else:
+                    try:
+                        status, payload = await self._until_disconnect(reader, self._dispatch(method, parts[1], body))
+                    except ClientDisconnected:
+                        METRICS.count_http(method, path, 499)
+                        _log(f'http: {host} "{request_line}" 499 -')
+                        return
+                    await self._send(writer, status, payload, keep_alive, headers.get("accept-encoding", ""))
+                METRICS.count_http(method, path, status)
+                _log(f'http: {host} "{request_line}" {status} -')
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._open_connections -= 1
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+
+async def _main_async() -> int:
+    client = AsyncMcpWorkerPool(command=MCP_COMMAND, cwd=MCP_CWD, size=POOL_SIZE)
+    try:
+        init_result = await client.initialize()
+        _log(f"mcp initialized: {_encode_json(init_result).decode('utf-8')}")
+    except Exception:
+        await client.close()
+        raise
+
+    if RESTART_ENABLED:
+        client.start_supervisor()
+
+    bridge = AsyncBridgeServer(client, ResponseCache.from_env(), SingleFlight.from_env())
+    server = await asyncio.start_server(
+        bridge.handle_connection, BRIDGE_HOST, BRIDGE_PORT, backlog=LISTEN_BACKLOG
+    )
+
+    stop_event = asyncio.Event()
+
+    def _shutdown() -> None:
+        if stop_event.is_set():
+            return
+        stop_event.set()
+        bridge.draining = True
+        _log("shutdown requested")
+
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, _shutdown)
+    loop.add_signal_handler(signal.SIGTERM, _shutdown)
+
+    try:
+        await stop_event.wait()
+    finally:
+        _log("stopping bridge")
+        server.close()
+        await client.close()
+    return 0
+
+
 def main() -> int:
     _log(f"starting bridge on {BRIDGE_HOST}:{BRIDGE_PORT}")
     _log(f"mcp command: {MCP_COMMAND}")
     _log(f"mcp cwd: {MCP_CWD}")
     _log(f"stdio protocol: {MCP_BRIDGE_STDIO_PROTOCOL}")
+    _log(f"pool size: {POOL_SIZE}")
+    _log(f"server mode: {SERVER_MODE}")
+    _log(f"json backend: {JSON_BACKEND}")
+    if COMPRESSION:
+        _log(f"compression: {', '.join(COMPRESSION)} from {COMPRESS_MIN_BYTES} bytes")
+
+    if SERVER_MODE == "asyncio":
+        return asyncio.run(_main_async())
 
-    client = StdioMcpClient(command=MCP_COMMAND, cwd=MCP_CWD)
+    client = McpWorkerPool(command=MCP_COMMAND, cwd=MCP_CWD, size=POOL_SIZE)
     try:
         init_result = client.initialize()
-        _log(f"mcp initialized: {json.dumps(init_result, ensure_ascii=False)}")
+        _log(f"mcp initialized: {_encode_json(init_result).decode('utf-8')}")
     except Exception:
         client.close()
         raise
 
-    server = ThreadingHTTPServer((BRIDGE_HOST, BRIDGE_PORT), make_handler(client))
+    if RESTART_ENABLED:
+        client.start_supervisor()
+
+    handler = make_handler(client, ResponseCache.from_env(), SingleFlight.from_env())
+    server = PooledHTTPServer((BRIDGE_HOST, BRIDGE_PORT), handler, HTTP_THREADS)
+    _log(f"http threads: {HTTP_THREADS}, keep-alive: {KEEPALIVE_TIMEOUT_SEC:g}s")
 
     stop_event = threading.Event()
 
@@ -408,8 +3389,10 @@ def main() -> int:
         if stop_event.is_set():
             return
         stop_event.set()
+        server.draining = True
         _log("shutdown requested")
-        server.shutdown()
+        # shutdown() waits for serve_forever(), which runs on this (the main) thread.
+        threading.Thread(target=server.shutdown, daemon=True).start()
 
     signal.signal(signal.SIGINT, _shutdown)
     signal.signal(signal.SIGTERM, _shutdown)
@@ -7,7 +7,8 @@ CREATE TABLE IF NOT EXISTS super_ris.rs (
   rechtsgebiet_primary text,
   schlagworte text[] DEFAULT ARRAY[]::text[],
   fachgebiete text[] DEFAULT ARRAY[]::text[],
-  entscheidungsdatum date
+  entscheidungsdatum date,
+  content_hash text
 );
 
 CREATE TABLE IF NOT EXISTS super_ris.te (
@@ -18,7 +19,8 @@ CREATE TABLE IF NOT EXISTS super_ris.te (
   entscheidungsdatum date,
   summary text,
   source_json jsonb,
-  original_html text
+  original_html text,
+  content_hash text
 );
 
 CREATE INDEX IF NOT EXISTS idx_super_ris_rs_kurzinformation_fts
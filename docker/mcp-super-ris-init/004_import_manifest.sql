@@ -0,0 +1,12 @@
+-- File fingerprints of imported artifacts, used by the importers' --incremental mode.
+-- Safe to run repeatedly; the importers run this file on start if the table is missing.
+
+CREATE TABLE IF NOT EXISTS super_ris.import_manifest (
+  importer text NOT NULL,
+  path text NOT NULL,
+  size bigint NOT NULL,
+  mtime_ns bigint NOT NULL,
+  sha256 text NOT NULL,
+  imported_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (importer, path)
+);
@@ -0,0 +1,8 @@
+-- Per-row content hash written by the importers; re-imports skip rows whose hash is unchanged.
+-- Safe to run repeatedly; the importers run this file on start if the column is missing.
+
+ALTER TABLE IF EXISTS super_ris.rs
+  ADD COLUMN IF NOT EXISTS content_hash text;
+
+ALTER TABLE IF EXISTS super_ris.te
+  ADD COLUMN IF NOT EXISTS content_hash text;
@@ -0,0 +1,17 @@
+-- Resume position of the importers' --resume mode (last committed file per root and glob,
+-- plus the files that failed before it and are retried on resume).
+-- Safe to run repeatedly; the importers run this file on start if the table or column is missing.
+
+CREATE TABLE IF NOT EXISTS super_ris.import_checkpoint (
+  importer text NOT NULL,
+  json_root text NOT NULL,
+  glob text NOT NULL,
+  last_path text NOT NULL,
+  failed_paths text[] NOT NULL DEFAULT '{}',
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (importer, json_root, glob)
+);
+
+-- Tables created before failed_paths existed.
+ALTER TABLE super_ris.import_checkpoint
+  ADD COLUMN IF NOT EXISTS failed_paths text[] NOT NULL DEFAULT '{}';
@@ -0,0 +1,628 @@
+"""Shared machinery of the Super-RIS importers (import_super_ris_te.py, import_super_ris_rs.py).
+
+JSON backend selection, the streaming file scanner, the --incremental manifest, --resume
+checkpoints and the batched upsert/COPY writer. Each importer supplies its table-specific
+SQL and field mapping as an ImportTarget.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+try:  # optional fast JSON backends; stdlib json is always the fallback
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _select_json_backend(requested: str) -> str:
+    requested = (requested or "auto").strip().lower()
+    if requested in {"auto", "orjson"} and orjson is not None:
+        return "orjson"
+    if requested in {"auto", "msgspec"} and msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+JSON_BACKEND = _select_json_backend(os.getenv("IMPORT_JSON_BACKEND", "auto"))
+_FAST_JSON_ERRORS: tuple[type[BaseException], ...] = (ValueError, TypeError, OverflowError)
+if msgspec is not None:
+    _FAST_JSON_ERRORS += (msgspec.MsgspecError,)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse with the fast backend; input it rejects (NaN, >64-bit ints) is retried with stdlib."""
+    try:
+        if JSON_BACKEND == "orjson":
+            return orjson.loads(data)
+        if JSON_BACKEND == "msgspec":
+            return msgspec.json.decode(data)
+    except _FAST_JSON_ERRORS:
+        pass
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def json_dumps(value: Any) -> str:
+    """Compact, non-ASCII-preserving JSON text; identical semantics for every backend."""
+    try:
+        if JSON_BACKEND == "orjson":
+            return orjson.dumps(value).decode("utf-8")
+        if JSON_BACKEND == "msgspec":
+            return msgspec.json.encode(value).decode("utf-8")
+    except _FAST_JSON_ERRORS:
+        pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# (size, mtime_ns, sha256) of an artifact as read, for the --incremental manifest.
+Fingerprint = tuple[int, int, str]
+
+
+def read_fingerprinted(path: Path) -> tuple[bytes, Fingerprint]:
+    with path.open("rb") as fh:
+        st = os.fstat(fh.fileno())
+        data = fh.read()
+    return data, (st.st_size, st.st_mtime_ns, hashlib.sha256(data).hexdigest())
+
+
+def content_hash(row: dict[str, Any]) -> str:
+    """SHA-256 over the column values of a row, stored so unchanged re-imports can skip the write."""
+    digest = hashlib.sha256()
+    for column, value in row.items():
+        digest.update(f"{column}={value!r}\x1f".encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Threads walking top-level subdirectories, and scanned paths buffered ahead of the parser.
+_SCAN_THREADS = 8
+_SCAN_QUEUE_SIZE = 4096
+
+
+class FileScanner:
+    """Streams files under `root` whose name matches `pattern`, as the walk finds them.
+
+    Default: top-level subdirectories are walked in parallel threads (os.scandir releases
+    the GIL) into a bounded queue, in filesystem order. `ordered`: one sorted depth-first
+    walk that yields exactly the order of sorted(root.rglob(pattern)). Either way the first
+    file is available at once and memory does not grow with the corpus. `scanned` counts
+    the paths yielded so far. With `start_after` (path parts relative to root) an ordered
+    walk skips that path and everything before it without descending into those folders.
+    """
+
+    def __init__(self, root: Path, pattern: str, limit: int = 0, ordered: bool = False):
+        self.root = root
+        self.pattern = pattern
+        self.limit = limit
+        self.ordered = ordered
+        self.start_after: tuple[str, ...] | None = None
+        self.scanned = 0
+
+    def __iter__(self) -> Iterator[Path]:
+        if "/" in self.pattern:
+            # Patterns with directory parts keep rglob's matching semantics.
+            found = iter(sorted(self.root.rglob(self.pattern))) if self.ordered else self.root.rglob(self.pattern)
+            paths = (
+                str(path)
+                for path in found
+                if not self.ordered
+                or self.start_after is None
+                or path.relative_to(self.root).parts > self.start_after
+            )
+        elif self.ordered:
+            paths = self._walk_sorted(str(self.root), ())
+        else:
+            paths = self._walk_parallel(str(self.root))
+        try:
+            for path in paths:
+                self.scanned += 1
+                yield Path(path)
+                if 0 < self.limit <= self.scanned:
+                    return
+        finally:
+            paths.close()
+
+    def _walk_sorted(self, directory: str, parts: tuple[str, ...]) -> Iterator[str]:
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+        start_after = self.start_after
+        for entry in entries:
+            entry_parts = parts + (entry.name,)
+            if entry.is_dir(follow_symlinks=False):
+                # Skip folders whose whole subtree sorts before the resume point.
+                if start_after is None or entry_parts >= start_after[: len(entry_parts)]:
+                    yield from self._walk_sorted(entry.path, entry_parts)
+            elif fnmatch.fnmatchcase(entry.name, self.pattern):
+                if start_after is None or entry_parts > start_after:
+                    yield entry.path
+
+    def _walk(self, top: str) -> Iterator[str]:
+        stack = [top]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif fnmatch.fnmatchcase(entry.name, self.pattern):
+                            yield entry.path
+            except OSError:
+                continue
+
+    def _walk_parallel(self, root: str) -> Iterator[str]:
+        subdirs: list[str] = []
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif fnmatch.fnmatchcase(entry.name, self.pattern):
+                yield entry.path
+        if not subdirs:
+            return
+
+        found: queue.Queue = queue.Queue(maxsize=_SCAN_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+
+        def put(item: object) -> bool:
+            while not stop.is_set():
+                try:
+                    found.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def walk(top: str) -> None:
+            try:
+                for path in self._walk(top):
+                    if not put(path):
+                        return
+            finally:
+                put(done)
+
+        pool = ThreadPoolExecutor(min(len(subdirs), _SCAN_THREADS), thread_name_prefix="scan")
+        try:
+            for subdir in subdirs:
+                pool.submit(walk, subdir)
+            pending = len(subdirs)
+            while pending:
+                item = found.get()
+                if item is done:
+                    pending -= 1
+                    continue
+                yield item
+        finally:
+            # Unblocks walkers stuck on a full queue when the consumer stops early.
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+_ARRAY_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+def _copy_field(value: Any) -> str:
+    """One field in COPY text format; lists become text[] literals."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, list):
+        value = "{" + ",".join('"' + str(item).translate(_ARRAY_ESCAPES) + '"' for item in value) + "}"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+class _CopyReader:
+    """File-like source for cursor.copy_expert that renders COPY lines on demand."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        while size < 0 or len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        if size < 0 or len(self._buffer) <= size:
+            out, self._buffer = self._buffer, ""
+        else:
+            out, self._buffer = self._buffer[:size], self._buffer[size:]
+        return out
+
+
+# Migrations in this directory the importers rely on. initdb runs them only on a fresh
+# volume, so ensure_schema() applies the ones an older database is missing; each file is
+# idempotent.
+SCHEMA_DIR = Path(__file__).resolve().parent
+SCHEMA_STATE_SQL = """
+SELECT
+  EXISTS (
+    SELECT 1
+    FROM information_schema.columns
+    WHERE table_schema = 'super_ris' AND table_name = %s AND column_name = 'content_hash'
+  ),
+  to_regclass('super_ris.import_manifest') IS NOT NULL,
+  EXISTS (
+    SELECT 1
+    FROM information_schema.columns
+    WHERE table_schema = 'super_ris' AND table_name = 'import_checkpoint' AND column_name = 'failed_paths'
+  );
+"""
+SCHEMA_MIGRATIONS = ("005_content_hash.sql", "004_import_manifest.sql", "006_import_checkpoint.sql")
+
+
+def ensure_schema(cur: psycopg2.extensions.cursor, table: str) -> None:
+    """Apply the migrations behind super_ris.{table}.content_hash, the manifest and the
+    checkpoint table if the database lacks them. Not called under --dry-run."""
+    cur.execute(SCHEMA_STATE_SQL, (table,))
+    for present, migration in zip(cur.fetchone(), SCHEMA_MIGRATIONS):
+        if not present:
+            cur.execute((SCHEMA_DIR / migration).read_text(encoding="utf-8"))
+
+
+def _table_exists(cur: psycopg2.extensions.cursor, name: str) -> bool:
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL", (f"super_ris.{name}",))
+    return cur.fetchone()[0]
+
+
+MANIFEST_UPSERT_SQL = """
+INSERT INTO super_ris.import_manifest (importer, path, size, mtime_ns, sha256) VALUES %s
+ON CONFLICT (importer, path)
+DO UPDATE SET
+  size = EXCLUDED.size,
+  mtime_ns = EXCLUDED.mtime_ns,
+  sha256 = EXCLUDED.sha256,
+  imported_at = now();
+"""
+
+
+class Manifest:
+    """Fingerprints (size, mtime, sha256) of files already imported, for --incremental.
+
+    Entries are keyed by path relative to the JSON root and written in the same
+    transaction as the rows they describe, so a crash never marks unwritten files done.
+    """
+
+    def __init__(self, cur: psycopg2.extensions.cursor, importer: str, root: Path):
+        self.importer = importer
+        self.root = root
+        self.skipped = 0
+        self._entries: dict[str, Fingerprint] = {}
+        # Missing under --dry-run on a database ensure_schema() has not touched yet.
+        if _table_exists(cur, "import_manifest"):
+            cur.execute(
+                "SELECT path, size, mtime_ns, sha256 FROM super_ris.import_manifest WHERE importer = %s",
+                (importer,),
+            )
+            self._entries = {path: (size, mtime_ns, sha256) for path, size, mtime_ns, sha256 in cur}
+        self._pending: list[tuple[str, str, int, int, str]] = []
+
+    def _key(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def changed(self, files: Iterable[Path]) -> Iterator[tuple[Path, str | None]]:
+        """(path, hash of its last import) for files whose size or mtime changed."""
+        for path in files:
+            entry = self._entries.get(self._key(path))
+            if entry is None:
+                yield path, None
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                yield path, None  # the parser reports the error
+                continue
+            if (st.st_size, st.st_mtime_ns) == entry[:2]:
+                self.skipped += 1
+                continue
+            yield path, entry[2]
+
+    def record(self, path: Path, fingerprint: Fingerprint | None) -> None:
+        if fingerprint is not None:
+            self._pending.append((self.importer, self._key(path), *fingerprint))
+
+    def flush(self, cur: psycopg2.extensions.cursor) -> None:
+        if self._pending:
+            execute_values(cur, MANIFEST_UPSERT_SQL, self._pending, page_size=1000)
+            self._pending = []
+
+
+CHECKPOINT_UPSERT_SQL = """
+INSERT INTO super_ris.import_checkpoint (importer, json_root, glob, last_path, failed_paths)
+VALUES (%s, %s, %s, %s, %s)
+ON CONFLICT (importer, json_root, glob)
+DO UPDATE SET
+  last_path = EXCLUDED.last_path,
+  failed_paths = EXCLUDED.failed_paths,
+  updated_at = now();
+"""
+
+
+class Checkpoint:
+    """Last committed position of a --resume run, in the sorted order of --ordered.
+
+    Saved in the transaction of every commit, so it never points past committed rows,
+    and removed once the run completes. Files that failed up to that position are saved
+    with it and retried first by the next --resume run (`retry_paths`). They stay in the
+    saved list until processed again (see retried()), so a resumed run that dies too does
+    not lose them; the position only moves forward, so retrying them does not rewind it.
+    """
+
+    def __init__(self, cur: psycopg2.extensions.cursor, importer: str, root: Path, pattern: str):
+        self.importer = importer
+        self.root = root
+        self.pattern = pattern
+        self.last_path: str | None = None
+        self.retry_paths: list[Path] = []
+        self._retrying: set[Path] = set()
+        self._failed: set[tuple[str, ...]] = set()
+        if _table_exists(cur, "import_checkpoint"):
+            cur.execute(
+                "SELECT last_path, failed_paths FROM super_ris.import_checkpoint "
+                "WHERE importer = %s AND json_root = %s AND glob = %s",
+                (importer, str(root), pattern),
+            )
+            row = cur.fetchone()
+            if row:
+                self.last_path = row[0]
+                self.retry_paths = [root / rel_path for rel_path in row[1]]
+                self._retrying = set(self.retry_paths)
+                self._failed = {tuple(rel_path.split("/")) for rel_path in row[1]}
+
+    @property
+    def start_after(self) -> tuple[str, ...] | None:
+        return tuple(self.last_path.split("/")) if self.last_path else None
+
+    def retried(self, path: Path) -> None:
+        """Forget the earlier failure of a retry path as it is processed again; its rows
+        are written before the next save, and fail() records it again if it still fails."""
+        if path in self._retrying:
+            self._retrying.discard(path)
+            self._failed.discard(path.relative_to(self.root).parts)
+
+    def fail(self, path: Path) -> None:
+        self._failed.add(path.relative_to(self.root).parts)
+
+    def save(self, cur: psycopg2.extensions.cursor, path: Path) -> None:
+        parts = path.relative_to(self.root).parts
+        if self.start_after is None or parts > self.start_after:
+            self.last_path = "/".join(parts)
+        # Later failures are rescanned after the position anyway.
+        failed = sorted("/".join(parts) for parts in self._failed if parts <= self.start_after)
+        cur.execute(
+            CHECKPOINT_UPSERT_SQL, (self.importer, str(self.root), self.pattern, self.last_path, failed)
+        )
+
+    def clear(self, cur: psycopg2.extensions.cursor) -> None:
+        cur.execute(
+            "DELETE FROM super_ris.import_checkpoint WHERE importer = %s AND json_root = %s AND glob = %s",
+            (self.importer, str(self.root), self.pattern),
+        )
+
+
+class ImportTarget:
+    """Table-specific parts of an importer: target table, key column, the upsert/merge SQL
+    (see import_super_ris_te.py / import_super_ris_rs.py), log prefix and the verbose
+    description of a row."""
+
+    def __init__(
+        self,
+        table: str,
+        key: str,
+        columns: tuple[str, ...],
+        upsert_sql: str,
+        upsert_template: str,
+        merge_sql: str,
+        log_prefix: str,
+        describe: Callable[[dict[str, Any]], str],
+    ):
+        self.table = table
+        self.key = key
+        self.columns = columns
+        self.upsert_sql = upsert_sql
+        self.upsert_template = upsert_template
+        self.merge_sql = merge_sql
+        self.log_prefix = log_prefix
+        self.describe = describe
+        # merge_sql reads from this per-session staging table.
+        self.staging_table = f"{table}_import_staging"
+        self.staging_sql = (
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} (seq bigint, LIKE super_ris.{table})"
+        )
+        self.copy_sql = f"COPY {self.staging_table} (seq, {', '.join(columns)}) FROM STDIN"
+
+
+def _upsert_batch(
+    cur: psycopg2.extensions.cursor,
+    target: ImportTarget,
+    batch: list[tuple[int, Path, dict[str, Any]]],
+    verbose: bool,
+) -> tuple[int, int, int, list[int]]:
+    """Upsert a batch with one multi-row statement; returns (inserted, updated, unchanged, failed indexes).
+
+    If the statement fails, the batch is rolled back and split in halves until the
+    failing rows are isolated, so one bad file costs O(log n) retries instead of a
+    savepoint per row. Keys are unique within a batch (see BatchWriter.add). Rows whose
+    content_hash matches the stored one are not rewritten and come back as unchanged.
+    """
+    cur.execute("SAVEPOINT sp_import_batch")
+    try:
+        results = execute_values(
+            cur,
+            target.upsert_sql,
+            [row for _index, _path, row in batch],
+            template=target.upsert_template,
+            page_size=len(batch),
+            fetch=True,
+        )
+        cur.execute("RELEASE SAVEPOINT sp_import_batch")
+    except Exception as exc:
+        cur.execute("ROLLBACK TO SAVEPOINT sp_import_batch")
+        cur.execute("RELEASE SAVEPOINT sp_import_batch")
+        if len(batch) == 1:
+            print(f"{target.log_prefix} ERROR {batch[0][1]}: {exc}", file=sys.stderr)
+            return 0, 0, 0, [batch[0][0]]
+        middle = len(batch) // 2
+        left = _upsert_batch(cur, target, batch[:middle], verbose)
+        right = _upsert_batch(cur, target, batch[middle:], verbose)
+        return left[0] + right[0], left[1] + right[1], left[2] + right[2], left[3] + right[3]
+
+    written = {key: inserted for key, inserted in results}
+    inserted_count = sum(1 for inserted in written.values() if inserted)
+    if verbose:
+        for index, _path, row in batch:
+            if row[target.key] not in written:
+                action = "unchanged"
+            else:
+                action = "inserted" if written[row[target.key]] else "updated"
+            print(f"{target.log_prefix} {index:>6}: {action} {target.describe(row)}")
+    return inserted_count, len(written) - inserted_count, len(batch) - len(written), []
+
+
+def _copy_batch(
+    cur: psycopg2.extensions.cursor,
+    target: ImportTarget,
+    batch: list[tuple[int, Path, dict[str, Any]]],
+    verbose: bool,
+) -> tuple[int, int, int, list[int]]:
+    """COPY a batch into the staging table and merge it; returns (inserted, updated, unchanged, failed indexes).
+
+    If the batch fails (e.g. a row the DB rejects), it is rolled back and written with
+    _upsert_batch(), which isolates the bad rows.
+    """
+    lines = (
+        "\t".join([str(index)] + [_copy_field(row[column]) for column in target.columns]) + "\n"
+        for index, _path, row in batch
+    )
+    cur.execute("SAVEPOINT sp_import_copy")
+    try:
+        cur.execute(f"TRUNCATE {target.staging_table}")
+        cur.copy_expert(target.copy_sql, _CopyReader(lines), size=1024 * 1024)
+        cur.execute(target.merge_sql)
+        res = cur.fetchone()
+        cur.execute("RELEASE SAVEPOINT sp_import_copy")
+    except Exception as exc:
+        cur.execute("ROLLBACK TO SAVEPOINT sp_import_copy")
+        cur.execute("RELEASE SAVEPOINT sp_import_copy")
+        reason = str(exc).strip().split("\n", 1)[0]
+        print(
+            f"{target.log_prefix} batch of {len(batch)} failed ({reason}), retrying as upserts",
+            file=sys.stderr,
+        )
+        return _upsert_batch(cur, target, batch, verbose)
+    inserted, written = (int(res[0]), int(res[1])) if res else (0, 0)
+    if verbose:
+        print(
+            f"{target.log_prefix} {batch[-1][0]:>6}: copied {len(batch)} inserted={inserted} "
+            f"updated={written - inserted} unchanged={len(batch) - written}"
+        )
+    return inserted, written - inserted, len(batch) - written, []
+
+
+class BatchWriter:
+    """Buffers parsed rows and writes them in batches, committing every `commit_every` rows."""
+
+    def __init__(
+        self,
+        conn: psycopg2.extensions.connection,
+        cur: psycopg2.extensions.cursor,
+        target: ImportTarget,
+        batch_size: int,
+        commit_every: int,
+        copy: bool,
+        verbose: bool,
+        manifest: Manifest | None = None,
+        checkpoint: Checkpoint | None = None,
+    ):
+        self.conn = conn
+        self.cur = cur
+        self.target = target
+        self.batch_size = max(1, batch_size)
+        self.commit_every = commit_every
+        self.copy = copy
+        self.verbose = verbose
+        self.manifest = manifest
+        self.checkpoint = checkpoint
+        # Path of the last row handed to add(); every file up to it is written once flushed.
+        self.position: Path | None = None
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.failed = 0
+        self._batch: list[tuple[int, Path, dict[str, Any]]] = []
+        self._keys: set[str] = set()
+        self._fingerprints: dict[int, Fingerprint] = {}
+        self._since_commit = 0
+        if copy:
+            cur.execute(target.staging_sql)
+
+    def add(
+        self,
+        index: int,
+        path: Path,
+        row: dict[str, Any],
+        fingerprint: Fingerprint | None = None,
+    ) -> None:
+        # A key seen twice in one statement is an error for ON CONFLICT DO UPDATE; flushing
+        # first keeps "last file wins" and the per-file counts of row-by-row upserts.
+        if row[self.target.key] in self._keys:
+            self.flush()
+        self._batch.append((index, path, row))
+        self._keys.add(row[self.target.key])
+        if fingerprint is not None:
+            self._fingerprints[index] = fingerprint
+        self.position = path
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._batch:
+            write = _copy_batch if self.copy else _upsert_batch
+            inserted, updated, unchanged, failed = write(self.cur, self.target, self._batch, self.verbose)
+            self.inserted += inserted
+            self.updated += updated
+            self.unchanged += unchanged
+            self.failed += len(failed)
+            self._since_commit += inserted + updated + unchanged
+            failed_indexes = set(failed)
+            for index, path, _row in self._batch:
+                if index in failed_indexes:
+                    if self.checkpoint is not None:
+                        self.checkpoint.fail(path)
+                elif self.manifest is not None:
+                    self.manifest.record(path, self._fingerprints.get(index))
+            self._batch = []
+            self._keys = set()
+            self._fingerprints = {}
+        if self.manifest is not None:
+            self.manifest.flush(self.cur)
+        if self.commit_every > 0 and self._since_commit >= self.commit_every:
+            if self.checkpoint is not None and self.position is not None:
+                self.checkpoint.save(self.cur, self.position)
+            self.conn.commit()
+            self._since_commit = 0
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Compare JSON backends (stdlib json, orjson, msgspec) on TE/RS artifacts.
+
+Measures what the importers do per file: parse the raw bytes and re-serialize
+the payload for the `source_json` column. Every backend's result is checked
+against stdlib json so a faster library never silently changes the data.
+
+Runs without a database; backends that are not installed are skipped.
+
+Examples:
+  python3 bench_json_backends.py --json-root /srv/super-ris-artifacts --limit 2000
+  python3 bench_json_backends.py --synthetic 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark JSON backends on TE/RS JSON files")
+    parser.add_argument(
+        "--json-root",
+        default=os.getenv("IMPORT_JSON_ROOT", ""),
+        help="Root folder scanned recursively for JSON files",
+    )
+    parser.add_argument(
+        "--glob",
+        default=os.getenv("IMPORT_JSON_GLOB", "*_TE.json"),
+        help="Glob pattern for JSON files",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=1000,
+        help="Limit number of JSON files (0 = no limit)",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="Generate N TE-like payloads instead of reading files (used when --json-root is empty)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=3,
+        help="Timed rounds per backend; the best round is reported",
+    )
+    return parser.parse_args()
+
+
+def _collect_json_files(root: Path, pattern: str, limit: int) -> list[Path]:
+    files = sorted(p for p in root.rglob(pattern) if p.is_file())
+    if limit > 0:
+        return files[:limit]
+    return files
+
+
+def _synthetic_payloads(count: int) -> list[bytes]:
+    rng = random.Random(1295)
+    words = "Schadenersatz Gewährleistung Rechtssatz Revision zurückgewiesen § ABGB OGH Berufung".split()
+    docs = []
+    for index in range(count):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(200, 4000)))
+        payload = {
+            "stable_key": f"JJT_2024{index:06d}_OGH0002_00000",
+            "geschaeftszahl": f"{rng.randint(1, 10)}Ob{rng.randint(1, 250)}/24{chr(97 + index % 26)}",
+            "entscheidungsdatum": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "summary": text[:600],
+            "te": {
+                "kopf_html": f"<p>{text[:400]}</p>",
+                "spruch": f"<p>{text[:800]}</p>",
+                "begruendung": f"<p>{text}</p>",
+            },
+            "basic": {"gericht": "OGH", "rechtsgebiet": "Zivilrecht", "normen": ["ABGB §1295", "ZPO §502"]},
+            "score": rng.random(),
+        }
+        docs.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return docs
+
+
+def _backends() -> dict[str, tuple[Callable[[bytes], Any], Callable[[Any], Any]]]:
+    backends: dict[str, tuple[Callable[[bytes], Any], Callable[[Any], Any]]] = {
+        "json": (
+            lambda data: json.loads(data.decode("utf-8")),
+            lambda value: json.dumps(value, ensure_ascii=False, separators=(",", ":")),
+        ),
+    }
+    if orjson is not None:
+        backends["orjson"] = (orjson.loads, orjson.dumps)
+    if msgspec is not None:
+        backends["msgspec"] = (msgspec.json.decode, msgspec.json.encode)
+    return backends
+
+
+def _best_of(rounds: int, fn: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(max(1, rounds)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.json_root:
+        files = _collect_json_files(Path(args.json_root), args.glob, args.limit)
+        docs = [path.read_bytes() for path in files]
+        source = f"{len(docs)} files from {args.json_root} ({args.glob})"
+    else:
+        docs = _synthetic_payloads(args.synthetic or 1000)
+        source = f"{len(docs)} synthetic TE payloads"
+    if not docs:
+        print("[bench-json] no input files", file=sys.stderr)
+        return 1
+
+    total_mb = sum(len(doc) for doc in docs) / 1_000_000
+    print(f"[bench-json] {source}, {total_mb:.1f} MB")
+
+    reference = [json.loads(doc.decode("utf-8")) for doc in docs]
+    baseline: float | None = None
+    print(f"{'backend':<9} {'loads MB/s':>11} {'dumps MB/s':>11} {'us/file':>9} {'speedup':>8}  equal")
+    for name, (loads, dumps) in _backends().items():
+        try:
+            parsed = [loads(doc) for doc in docs]
+            equal = parsed == reference and all(
+                json.loads(dumps(value)) == value for value in parsed
+            )
+        except Exception as exc:  # report and keep comparing the others
+            print(f"{name:<9} failed: {exc}")
+            continue
+        load_s = _best_of(args.rounds, lambda: [loads(doc) for doc in docs])
+        dump_s = _best_of(args.rounds, lambda: [dumps(value) for value in parsed])
+        per_file_us = (load_s + dump_s) / len(docs) * 1e6
+        if baseline is None:
+            baseline = per_file_us
+        print(
+            f"{name:<9} {total_mb / load_s:>11.1f} {total_mb / dump_s:>11.1f} "
+            f"{per_file_us:>9.1f} {baseline / per_file_us:>7.2f}x  {'yes' if equal else 'NO'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
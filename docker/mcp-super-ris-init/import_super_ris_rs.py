@@ -4,7 +4,7 @@
 from __future__ import annotations
 
 import argparse
-import json
+import itertools
 import os
 import re
 import sys
@@ -14,6 +14,19 @@ from typing import Any
 
 import psycopg2
 
+from _import_common import (
+    JSON_BACKEND,
+    BatchWriter,
+    Checkpoint,
+    FileScanner,
+    ImportTarget,
+    Manifest,
+    content_hash,
+    ensure_schema,
+    json_loads,
+    read_fingerprinted,
+)
+
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Import *_RS.json into super_ris.rs")
@@ -39,6 +52,35 @@ def _parse_args() -> argparse.Namespace:
         default=int(os.getenv("IMPORT_RS_COMMIT_EVERY", os.getenv("IMPORT_COMMIT_EVERY", "1000"))),
         help="Commit DB transaction every N upserts (0 = commit once at end)",
     )
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="Bulk mode: COPY rows into a temp staging table and merge each batch with one upsert",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=int(os.getenv("IMPORT_RS_BATCH_SIZE", os.getenv("IMPORT_BATCH_SIZE", "1000"))),
+        help="Rows per multi-row upsert or COPY batch (1 = row by row)",
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Process files in sorted path order (single-threaded walk) instead of filesystem order",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Save a checkpoint at every commit and continue after the last one of an interrupted "
+            "run; the interrupted run must have used --resume too (implies --ordered)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files whose size/mtime or content hash match super_ris.import_manifest",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Parse and report only")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     return parser.parse_args()
@@ -202,7 +244,7 @@ def _extract_row(payload: dict[str, Any], path: Path) -> dict[str, Any] | None:
         or _get_nested(payload, "meta", "entscheidungsdatum")
     )
 
-    return {
+    row = {
         "rs_number": rs_number,
         "rechtssatz_volltext": rechtssatz_volltext,
         "kurzinformation": kurzinformation,
@@ -211,17 +253,8 @@ def _extract_row(payload: dict[str, Any], path: Path) -> dict[str, Any] | None:
         "fachgebiete": fachgebiete,
         "entscheidungsdatum": entscheidungsdatum,
     }
-
-
-def _collect_json_files(root: Path, pattern: str, limit: int) -> list[Path]:
-    if limit > 0:
-        files: list[Path] = []
-        for path in root.rglob(pattern):
-            files.append(path)
-            if len(files) >= limit:
-                break
-        return sorted(files)
-    return sorted(root.rglob(pattern))
+    row["content_hash"] = content_hash(row)
+    return row
 
 
 def _build_conn() -> psycopg2.extensions.connection:
@@ -251,16 +284,9 @@ INSERT INTO super_ris.rs (
   rechtsgebiet_primary,
   schlagworte,
   fachgebiete,
-  entscheidungsdatum
-) VALUES (
-  %(rs_number)s,
-  %(rechtssatz_volltext)s,
-  %(kurzinformation)s,
-  %(rechtsgebiet_primary)s,
-  %(schlagworte)s,
-  %(fachgebiete)s,
-  %(entscheidungsdatum)s
-)
+  entscheidungsdatum,
+  content_hash
+) VALUES %s
 ON CONFLICT (rs_number)
 DO UPDATE SET
   rechtssatz_volltext = EXCLUDED.rechtssatz_volltext,
@@ -268,54 +294,180 @@ DO UPDATE SET
   rechtsgebiet_primary = EXCLUDED.rechtsgebiet_primary,
   schlagworte = EXCLUDED.schlagworte,
   fachgebiete = EXCLUDED.fachgebiete,
-  entscheidungsdatum = EXCLUDED.entscheidungsdatum
-RETURNING (xmax = 0) AS inserted;
+  entscheidungsdatum = EXCLUDED.entscheidungsdatum,
+  content_hash = EXCLUDED.content_hash
+WHERE super_ris.rs.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+RETURNING rs_number, (xmax = 0) AS inserted;
+"""
+
+# One VALUES tuple per row; execute_values() joins a whole batch into one statement.
+UPSERT_TEMPLATE = """(
+  %(rs_number)s,
+  %(rechtssatz_volltext)s,
+  %(kurzinformation)s,
+  %(rechtsgebiet_primary)s,
+  %(schlagworte)s::text[],
+  %(fachgebiete)s::text[],
+  %(entscheidungsdatum)s,
+  %(content_hash)s
+)"""
+
+RS_COLUMNS = (
+    "rs_number",
+    "rechtssatz_volltext",
+    "kurzinformation",
+    "rechtsgebiet_primary",
+    "schlagworte",
+    "fachgebiete",
+    "entscheidungsdatum",
+    "content_hash",
+)
+
+# Last file wins for duplicate rs_numbers within a batch, as with row-by-row upserts.
+MERGE_SQL = """
+WITH merged AS (
+  INSERT INTO super_ris.rs (
+    rs_number,
+    rechtssatz_volltext,
+    kurzinformation,
+    rechtsgebiet_primary,
+    schlagworte,
+    fachgebiete,
+    entscheidungsdatum,
+    content_hash
+  )
+  SELECT DISTINCT ON (rs_number)
+    rs_number,
+    rechtssatz_volltext,
+    kurzinformation,
+    rechtsgebiet_primary,
+    schlagworte,
+    fachgebiete,
+    entscheidungsdatum,
+    content_hash
+  FROM rs_import_staging
+  ORDER BY rs_number, seq DESC
+  ON CONFLICT (rs_number)
+  DO UPDATE SET
+    rechtssatz_volltext = EXCLUDED.rechtssatz_volltext,
+    kurzinformation = EXCLUDED.kurzinformation,
+    rechtsgebiet_primary = EXCLUDED.rechtsgebiet_primary,
+    schlagworte = EXCLUDED.schlagworte,
+    fachgebiete = EXCLUDED.fachgebiete,
+    entscheidungsdatum = EXCLUDED.entscheidungsdatum,
+    content_hash = EXCLUDED.content_hash
+  WHERE super_ris.rs.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+  RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FROM merged;
 """
 
 
+def _describe_row(row: dict[str, Any]) -> str:
+    return f"rs={row['rs_number']}"
+
+
+TARGET = ImportTarget(
+    table="rs",
+    key="rs_number",
+    columns=RS_COLUMNS,
+    upsert_sql=UPSERT_SQL,
+    upsert_template=UPSERT_TEMPLATE,
+    merge_sql=MERGE_SQL,
+    log_prefix="[import-rs]",
+    describe=_describe_row,
+)
+
+
 def main() -> int:
     args = _parse_args()
     json_root = Path(args.json_root).resolve()
     if not json_root.exists():
         print(f"[import-rs] json root not found: {json_root}", file=sys.stderr)
         return 2
+    if args.resume and args.commit_every <= 0:
+        print(
+            "[import-rs] --resume needs --commit-every > 0 (no checkpoint without intermediate commits)",
+            file=sys.stderr,
+        )
+        return 2
 
-    files = _collect_json_files(json_root, args.glob, args.limit)
-    if not files:
-        print(f"[import-rs] no files matched {args.glob} under {json_root}")
-        return 0
-
-    print(f"[import-rs] scanning {len(files)} file(s) from {json_root}")
+    scanner = FileScanner(json_root, args.glob, args.limit, args.ordered or args.resume)
+    print(
+        f"[import-rs] scanning {json_root} for {args.glob} "
+        f"(json backend: {JSON_BACKEND}, order: {'sorted' if scanner.ordered else 'filesystem'})"
+    )
     if args.dry_run:
         print("[import-rs] dry-run mode enabled")
 
-    inserted = 0
-    updated = 0
     failed = 0
     skipped = 0
-    upserted_since_commit = 0
 
     conn = None
     cur = None
+    writer = None
+    manifest = None
+    checkpoint = None
     try:
-        if not args.dry_run:
+        if not args.dry_run or args.incremental or args.resume:
             conn = _build_conn()
             cur = conn.cursor()
-
-        for index, path in enumerate(files, start=1):
+            if not args.dry_run:
+                ensure_schema(cur, TARGET.table)
+        if args.resume:
+            checkpoint = Checkpoint(cur, "rs", json_root, args.glob)
+            scanner.start_after = checkpoint.start_after
+            if checkpoint.last_path:
+                print(
+                    f"[import-rs] resuming after {checkpoint.last_path}, "
+                    f"retrying {len(checkpoint.retry_paths)} failed file(s) first"
+                )
+            else:
+                print(
+                    f"[import-rs] no checkpoint for {json_root} ({args.glob}), starting from the beginning; "
+                    "only runs started with --resume write checkpoints"
+                )
+        if args.incremental:
+            manifest = Manifest(cur, "rs", json_root)
+        if not args.dry_run:
+            writer = BatchWriter(
+                conn, cur, TARGET, args.batch_size, args.commit_every, args.copy, args.verbose, manifest, checkpoint
+            )
+        retry_paths = checkpoint.retry_paths if checkpoint is not None else []
+        paths = itertools.chain(retry_paths, scanner)
+        tasks = manifest.changed(paths) if manifest is not None else ((path, None) for path in paths)
+
+        for index, (path, known_hash) in enumerate(tasks, start=1):
+            if checkpoint is not None:
+                checkpoint.retried(path)
             try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
+                fingerprint = None
+                if manifest is not None:
+                    data, fingerprint = read_fingerprinted(path)
+                    if fingerprint[2] == known_hash:
+                        # Touched but identical content: only refresh size/mtime in the manifest.
+                        manifest.skipped += 1
+                        if writer is not None:
+                            manifest.record(path, fingerprint)
+                        if args.verbose:
+                            print(f"[import-rs] {index:>6}: skipped (content unchanged) path={path}")
+                        continue
+                else:
+                    data = path.read_bytes()
+                payload = json_loads(data)
                 if not isinstance(payload, dict):
                     raise ValueError("JSON root is not an object")
 
                 row = _extract_row(payload, path)
                 if row is None:
                     skipped += 1
+                    if manifest is not None and writer is not None:
+                        manifest.record(path, fingerprint)
                     if args.verbose:
                         print(f"[import-rs] {index:>6}: skipped (no rs_number) path={path}")
                     continue
 
-                if args.dry_run:
+                if writer is None:
                     if args.verbose:
                         print(
                             f"[dry-run-rs] {index:>6}: rs={row['rs_number']} "
@@ -323,42 +475,18 @@ def main() -> int:
                         )
                     continue
 
-                assert cur is not None
-                savepoint_name = f"sp_rs_{index}"
-                cur.execute(f"SAVEPOINT {savepoint_name}")
-                try:
-                    cur.execute(UPSERT_SQL, row)
-                    res = cur.fetchone()
-                    cur.execute(f"RELEASE SAVEPOINT {savepoint_name}")
-                except Exception:
-                    cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint_name}")
-                    cur.execute(f"RELEASE SAVEPOINT {savepoint_name}")
-                    raise
-
-                if res and bool(res[0]):
-                    inserted += 1
-                    action = "inserted"
-                else:
-                    updated += 1
-                    action = "updated"
-
-                if args.verbose:
-                    print(f"[import-rs] {index:>6}: {action} rs={row['rs_number']}")
-
-                upserted_since_commit += 1
-                if (
-                    conn is not None
-                    and args.commit_every > 0
-                    and upserted_since_commit >= args.commit_every
-                ):
-                    conn.commit()
-                    upserted_since_commit = 0
+                writer.add(index, path, row, fingerprint)
 
             except Exception as exc:  # keep loop robust
                 failed += 1
                 print(f"[import-rs] ERROR {path}: {exc}", file=sys.stderr)
+                if checkpoint is not None:
+                    checkpoint.fail(path)
 
-        if not args.dry_run and conn is not None:
+        if writer is not None:
+            writer.flush()
+            if checkpoint is not None:
+                checkpoint.clear(cur)
             conn.commit()
 
     except Exception as exc:
@@ -372,9 +500,20 @@ def main() -> int:
         if conn is not None:
             conn.close()
 
+    processed = scanner.scanned + len(retry_paths)
+    if processed == 0:
+        print(f"[import-rs] no files matched {args.glob} under {json_root}")
+        return 0
+
+    inserted = writer.inserted if writer is not None else 0
+    updated = writer.updated if writer is not None else 0
+    unchanged = writer.unchanged if writer is not None else 0
+    failed += writer.failed if writer is not None else 0
+    skipped_unchanged = manifest.skipped if manifest is not None else 0
     print(
         "[import-rs] done "
-        f"processed={len(files)} inserted={inserted} updated={updated} skipped={skipped} failed={failed} dry_run={args.dry_run}"
+        f"processed={processed} inserted={inserted} updated={updated} unchanged={unchanged} skipped={skipped} failed={failed} "
+        f"skipped_unchanged={skipped_unchanged} dry_run={args.dry_run}"
     )
     return 1 if failed > 0 and not args.dry_run else 0
 
@@ -16,16 +16,32 @@ Target table:
 from __future__ import annotations
 
 import argparse
-import json
+import itertools
 import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import psycopg2
-from psycopg2.extras import Json
+
+from _import_common import (
+    JSON_BACKEND,
+    BatchWriter,
+    Checkpoint,
+    FileScanner,
+    Fingerprint,
+    ImportTarget,
+    Manifest,
+    content_hash,
+    ensure_schema,
+    json_dumps,
+    json_loads,
+    read_fingerprinted,
+)
 
 
 def _parse_args() -> argparse.Namespace:
@@ -43,6 +59,11 @@ def _parse_args() -> argparse.Namespace:
         default=[],
         help="Optional extra HTML root (repeatable)",
     )
+    parser.add_argument(
+        "--html-index",
+        default=os.getenv("IMPORT_HTML_INDEX", ""),
+        help="Optional file to persist the HTML basename index in and reuse while the roots are unchanged",
+    )
     parser.add_argument(
         "--glob",
         default=os.getenv("IMPORT_JSON_GLOB", "*_TE.json"),
@@ -60,6 +81,41 @@ def _parse_args() -> argparse.Namespace:
         default=int(os.getenv("IMPORT_COMMIT_EVERY", "1000")),
         help="Commit DB transaction every N upserts (0 = commit once at end)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("IMPORT_WORKERS", "1")),
+        help="Parser processes (read + parse + HTML lookup) feeding the single DB writer (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--copy",
+        action="store_true",
+        help="Bulk mode: COPY rows into a temp staging table and merge each batch with one upsert",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=int(os.getenv("IMPORT_BATCH_SIZE", "1000")),
+        help="Rows per multi-row upsert or COPY batch (1 = row by row)",
+    )
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Process files in sorted path order (single-threaded walk) instead of filesystem order",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Save a checkpoint at every commit and continue after the last one of an interrupted "
+            "run; the interrupted run must have used --resume too (implies --ordered)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip files whose size/mtime or content hash match super_ris.import_manifest",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -281,48 +337,229 @@ def _extract_inline_html(payload: dict[str, Any]) -> str | None:
     return None
 
 
+class _HtmlIndex:
+    """Basename -> paths of every *.html/*.htm under the search roots, built with one walk.
+
+    With --html-index the index is written to disk and reused as long as the roots are the
+    same and no indexed directory's mtime changed (adding, removing or renaming a file or
+    folder updates the mtime of its parent directory).
+    """
+
+    VERSION = 1
+    SUFFIXES = (".html", ".htm")
+
+    def __init__(self, roots: list[Path], paths: dict[str, list[str]], dirs: dict[str, int]):
+        self.roots = roots
+        self.paths = paths
+        self.dirs = dirs
+
+    @classmethod
+    def build(cls, roots: list[Path]) -> _HtmlIndex:
+        paths: dict[str, list[str]] = {}
+        dirs: dict[str, int] = {}
+        for root in roots:
+            found: dict[str, list[str]] = {}
+            stack = [str(root)]
+            while stack:
+                current = stack.pop()
+                try:
+                    dirs[current] = os.stat(current).st_mtime_ns
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.name.lower().endswith(cls.SUFFIXES):
+                                found.setdefault(entry.name, []).append(entry.path)
+                except OSError:
+                    continue
+            # Earlier roots first, sorted within a root, so lookups are deterministic.
+            for name, matches in found.items():
+                paths.setdefault(name, []).extend(sorted(matches))
+        return cls(roots, paths, dirs)
+
+    @classmethod
+    def load(cls, index_path: Path, roots: list[Path]) -> _HtmlIndex | None:
+        try:
+            data = json_loads(index_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != cls.VERSION
+            or data.get("roots") != [str(root) for root in roots]
+        ):
+            return None
+        dirs = data.get("dirs") or {}
+        for directory, mtime_ns in dirs.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        return cls(roots, data.get("paths") or {}, dirs)
+
+    def save(self, index_path: Path) -> None:
+        payload = {
+            "version": self.VERSION,
+            "roots": [str(root) for root in self.roots],
+            "dirs": self.dirs,
+            "paths": self.paths,
+        }
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        tmp_path.write_text(json_dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+
+    def candidates(self, rel_paths: list[str], json_dir: Path) -> Iterator[Path]:
+        """Indexed files for the referenced names: next to the JSON file first, then
+        paths ending in the referenced relative path, then the rest in root order."""
+        json_dir_str = str(json_dir)
+        seen: set[str] = set()
+        for rel in rel_paths:
+            rel_norm = rel.replace("\\", "/").lstrip("/")
+            matches = self.paths.get(rel_norm.rsplit("/", 1)[-1])
+            if not matches:
+                continue
+            suffix = "/" + rel_norm
+            ranked = sorted(
+                matches,
+                key=lambda match: (os.path.dirname(match) != json_dir_str, not match.endswith(suffix)),
+            )
+            for match in ranked:
+                if match not in seen:
+                    seen.add(match)
+                    yield Path(match)
+
+
+def _html_index_roots(json_root: Path, html_roots: list[Path]) -> list[Path]:
+    """HTML roots plus the JSON root (HTML next to the JSON files), without nested duplicates."""
+    roots: list[Path] = []
+    for root in html_roots + [json_root]:
+        if any(root == kept or root.is_relative_to(kept) for kept in roots):
+            continue
+        roots = [kept for kept in roots if not kept.is_relative_to(root)] + [root]
+    return roots
+
+
 def _resolve_original_html(
     payload: dict[str, Any],
     json_path: Path,
-    html_roots: list[Path],
+    html_index: _HtmlIndex,
 ) -> str | None:
     inline_html = _extract_inline_html(payload)
     if inline_html:
         return inline_html
 
-    rel_paths = _candidate_html_paths(payload)
-    search_roots = [json_path.parent] + html_roots
-    for rel in rel_paths:
-        rel_norm = rel.replace("\\", "/").lstrip("/")
-        basename = Path(rel_norm).name
-        for root in search_roots:
-            candidates = [
-                root / rel_norm,
-                root / basename,
-                root / "RIS_DOWNLOADS" / basename,
-                root / "RIS_DOWNLOADS" / "2021" / basename,
-                root / "RIS_DOWNLOADS" / "2022" / basename,
-                root / "RIS_DOWNLOADS" / "2023" / basename,
-                root / "RIS_DOWNLOADS" / "2024" / basename,
-                root / "RIS_DOWNLOADS" / "2025" / basename,
-                root / "RIS_DOWNLOADS" / "2026" / basename,
-            ]
-            for candidate in candidates:
-                html = _load_html_from_path(candidate)
-                if html:
-                    return html
+    for candidate in html_index.candidates(_candidate_html_paths(payload), json_path.parent):
+        html = _load_html_from_path(candidate)
+        if html:
+            return html
     return None
 
 
-def _collect_json_files(root: Path, pattern: str, limit: int) -> list[Path]:
-    if limit > 0:
-        files: list[Path] = []
-        for path in root.rglob(pattern):
-            files.append(path)
-            if len(files) >= limit:
-                break
-        return sorted(files)
-    return sorted(root.rglob(pattern))
+def _extract_row(payload: dict[str, Any], path: Path, html_index: _HtmlIndex) -> dict[str, Any]:
+    geschaeftszahl = _extract_geschaeftszahl(payload)
+    row = {
+        "stable_key": _extract_stable_key(payload, path),
+        "normalized_gz": _extract_normalized_gz(payload, geschaeftszahl),
+        "geschaeftszahl": geschaeftszahl,
+        "datum": _parse_date(
+            payload.get("datum")
+            or payload.get("entscheidungsdatum")
+            or _get_nested(payload, "metadata", "date")
+            or _get_nested(payload, "meta", "entscheidungsdatum")
+        ),
+        "entscheidungsdatum": _parse_date(
+            payload.get("entscheidungsdatum")
+            or payload.get("datum")
+            or _get_nested(payload, "metadata", "date")
+            or _get_nested(payload, "meta", "entscheidungsdatum")
+        ),
+        "summary": _extract_summary(payload),
+        # Serialized here so worker processes hand the writer a string, not the parsed tree.
+        "source_json": json_dumps(payload),
+        "original_html": _resolve_original_html(payload, path, html_index),
+    }
+    row["content_hash"] = content_hash(row)
+    return row
+
+
+# (path, row, error, fingerprint): row is None with an error message if the file failed,
+# and None without one if its content hash equals the hash of its last import.
+_ParseResult = tuple[Path, dict[str, Any] | None, str | None, Fingerprint | None]
+
+
+def _parse_file(
+    path: Path,
+    html_index: _HtmlIndex,
+    known_hash: str | None = None,
+    incremental: bool = False,
+) -> _ParseResult:
+    """Read and parse one artifact; never raises."""
+    fingerprint = None
+    try:
+        if incremental:
+            data, fingerprint = read_fingerprinted(path)
+            if fingerprint[2] == known_hash:
+                return path, None, None, fingerprint
+        else:
+            data = path.read_bytes()
+        payload = json_loads(data)
+        if not isinstance(payload, dict):
+            raise ValueError("JSON root is not an object")
+        return path, _extract_row(payload, path, html_index), None, fingerprint
+    except Exception as exc:  # reported by the writer, keeps the loop robust
+        return path, None, str(exc), fingerprint
+
+
+_WORKER_HTML_INDEX: _HtmlIndex | None = None
+_WORKER_INCREMENTAL = False
+# Paths per task sent to a parser process, and tasks in flight per process.
+_PARSE_CHUNK_SIZE = 32
+_PARSE_CHUNKS_PER_WORKER = 4
+
+
+def _init_parse_worker(html_index: _HtmlIndex, incremental: bool) -> None:
+    global _WORKER_HTML_INDEX, _WORKER_INCREMENTAL
+    _WORKER_HTML_INDEX = html_index
+    _WORKER_INCREMENTAL = incremental
+
+
+def _parse_chunk(tasks: list[tuple[Path, str | None]]) -> list[_ParseResult]:
+    return [
+        _parse_file(path, _WORKER_HTML_INDEX, known_hash, _WORKER_INCREMENTAL)
+        for path, known_hash in tasks
+    ]
+
+
+def _iter_parsed(
+    tasks: Iterable[tuple[Path, str | None]],
+    html_index: _HtmlIndex,
+    workers: int,
+    incremental: bool = False,
+) -> Iterator[_ParseResult]:
+    """Parse (path, known_hash) tasks in order; with workers > 1 a process pool parses
+    ahead of the writer.
+
+    At most workers * _PARSE_CHUNKS_PER_WORKER chunks are in flight, so memory stays
+    bounded when the DB is slower than parsing.
+    """
+    if workers <= 1:
+        for path, known_hash in tasks:
+            yield _parse_file(path, html_index, known_hash, incremental)
+        return
+    pool = ProcessPoolExecutor(workers, initializer=_init_parse_worker, initargs=(html_index, incremental))
+    try:
+        tasks = iter(tasks)
+        pending: deque = deque()
+        while chunk := list(itertools.islice(tasks, _PARSE_CHUNK_SIZE)):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= workers * _PARSE_CHUNKS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 def _build_conn() -> psycopg2.extensions.connection:
@@ -353,17 +590,9 @@ INSERT INTO super_ris.te (
   entscheidungsdatum,
   summary,
   source_json,
-  original_html
-) VALUES (
-  %(stable_key)s,
-  %(normalized_gz)s,
-  %(geschaeftszahl)s,
-  %(datum)s,
-  %(entscheidungsdatum)s,
-  %(summary)s,
-  %(source_json)s,
-  %(original_html)s
-)
+  original_html,
+  content_hash
+) VALUES %s
 ON CONFLICT (stable_key)
 DO UPDATE SET
   normalized_gz = EXCLUDED.normalized_gz,
@@ -372,17 +601,108 @@ DO UPDATE SET
   entscheidungsdatum = EXCLUDED.entscheidungsdatum,
   summary = EXCLUDED.summary,
   source_json = EXCLUDED.source_json,
-  original_html = EXCLUDED.original_html
-RETURNING (xmax = 0) AS inserted;
+  original_html = EXCLUDED.original_html,
+  content_hash = EXCLUDED.content_hash
+WHERE super_ris.te.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+RETURNING stable_key, (xmax = 0) AS inserted;
+"""
+
+# One VALUES tuple per row; execute_values() joins a whole batch into one statement.
+UPSERT_TEMPLATE = """(
+  %(stable_key)s,
+  %(normalized_gz)s,
+  %(geschaeftszahl)s,
+  %(datum)s,
+  %(entscheidungsdatum)s,
+  %(summary)s,
+  %(source_json)s::jsonb,
+  %(original_html)s,
+  %(content_hash)s
+)"""
+
+TE_COLUMNS = (
+    "stable_key",
+    "normalized_gz",
+    "geschaeftszahl",
+    "datum",
+    "entscheidungsdatum",
+    "summary",
+    "source_json",
+    "original_html",
+    "content_hash",
+)
+
+# Last file wins for duplicate keys within a batch, as with row-by-row upserts.
+MERGE_SQL = """
+WITH merged AS (
+  INSERT INTO super_ris.te (
+    stable_key,
+    normalized_gz,
+    geschaeftszahl,
+    datum,
+    entscheidungsdatum,
+    summary,
+    source_json,
+    original_html,
+    content_hash
+  )
+  SELECT DISTINCT ON (stable_key)
+    stable_key,
+    normalized_gz,
+    geschaeftszahl,
+    datum,
+    entscheidungsdatum,
+    summary,
+    source_json,
+    original_html,
+    content_hash
+  FROM te_import_staging
+  ORDER BY stable_key, seq DESC
+  ON CONFLICT (stable_key)
+  DO UPDATE SET
+    normalized_gz = EXCLUDED.normalized_gz,
+    geschaeftszahl = EXCLUDED.geschaeftszahl,
+    datum = EXCLUDED.datum,
+    entscheidungsdatum = EXCLUDED.entscheidungsdatum,
+    summary = EXCLUDED.summary,
+    source_json = EXCLUDED.source_json,
+    original_html = EXCLUDED.original_html,
+    content_hash = EXCLUDED.content_hash
+  WHERE super_ris.te.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+  RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FROM merged;
 """
 
 
+def _describe_row(row: dict[str, Any]) -> str:
+    return f"key={row['stable_key']} html={'yes' if row['original_html'] else 'no'}"
+
+
+TARGET = ImportTarget(
+    table="te",
+    key="stable_key",
+    columns=TE_COLUMNS,
+    upsert_sql=UPSERT_SQL,
+    upsert_template=UPSERT_TEMPLATE,
+    merge_sql=MERGE_SQL,
+    log_prefix="[import]",
+    describe=_describe_row,
+)
+
+
 def main() -> int:
     args = _parse_args()
     json_root = Path(args.json_root).resolve()
     if not json_root.exists():
         print(f"[import] json root not found: {json_root}", file=sys.stderr)
         return 2
+    if args.resume and args.commit_every <= 0:
+        print(
+            "[import] --resume needs --commit-every > 0 (no checkpoint without intermediate commits)",
+            file=sys.stderr,
+        )
+        return 2
 
     html_roots: list[Path] = []
     html_root_args = list(args.html_root)
@@ -396,110 +716,114 @@ def main() -> int:
         if item:
             html_roots.append(Path(item).resolve())
 
-    files = _collect_json_files(json_root, args.glob, args.limit)
-    if not files:
-        print(f"[import] no files matched {args.glob} under {json_root}")
-        return 0
-
-    print(f"[import] scanning {len(files)} file(s) from {json_root}")
+    scanner = FileScanner(json_root, args.glob, args.limit, args.ordered or args.resume)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    print(
+        f"[import] scanning {json_root} for {args.glob} "
+        f"(json backend: {JSON_BACKEND}, workers: {workers}, order: {'sorted' if scanner.ordered else 'filesystem'})"
+    )
     if args.dry_run:
         print("[import] dry-run mode enabled")
 
-    inserted = 0
-    updated = 0
+    index_roots = _html_index_roots(json_root, html_roots)
+    index_path = Path(args.html_index) if args.html_index else None
+    html_index = _HtmlIndex.load(index_path, index_roots) if index_path is not None else None
+    index_source = f"reused {index_path}"
+    if html_index is None:
+        html_index = _HtmlIndex.build(index_roots)
+        index_source = "built"
+        if index_path is not None:
+            try:
+                html_index.save(index_path)
+                index_source = f"built, saved to {index_path}"
+            except OSError as exc:
+                print(f"[import] WARN could not save html index {index_path}: {exc}", file=sys.stderr)
+    print(
+        f"[import] html index: {sum(len(paths) for paths in html_index.paths.values())} file(s) "
+        f"in {len(html_index.dirs)} dir(s) ({index_source})"
+    )
+
     failed = 0
     with_html = 0
-    upserted_since_commit = 0
 
     conn = None
     cur = None
+    writer = None
+    manifest = None
+    checkpoint = None
+    parsed = None
     try:
-        if not args.dry_run:
+        if not args.dry_run or args.incremental or args.resume:
             conn = _build_conn()
             cur = conn.cursor()
-
-        for index, path in enumerate(files, start=1):
-            try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
-                if not isinstance(payload, dict):
-                    raise ValueError("JSON root is not an object")
-
-                stable_key = _extract_stable_key(payload, path)
-                geschaeftszahl = _extract_geschaeftszahl(payload)
-                normalized_gz = _extract_normalized_gz(payload, geschaeftszahl)
-                entscheidungsdatum = _parse_date(
-                    payload.get("entscheidungsdatum")
-                    or payload.get("datum")
-                    or _get_nested(payload, "metadata", "date")
-                    or _get_nested(payload, "meta", "entscheidungsdatum")
+            if not args.dry_run:
+                ensure_schema(cur, TARGET.table)
+        if args.resume:
+            checkpoint = Checkpoint(cur, "te", json_root, args.glob)
+            scanner.start_after = checkpoint.start_after
+            if checkpoint.last_path:
+                print(
+                    f"[import] resuming after {checkpoint.last_path}, "
+                    f"retrying {len(checkpoint.retry_paths)} failed file(s) first"
                 )
-                datum = _parse_date(
-                    payload.get("datum")
-                    or payload.get("entscheidungsdatum")
-                    or _get_nested(payload, "metadata", "date")
-                    or _get_nested(payload, "meta", "entscheidungsdatum")
+            else:
+                print(
+                    f"[import] no checkpoint for {json_root} ({args.glob}), starting from the beginning; "
+                    "only runs started with --resume write checkpoints"
                 )
-                summary = _extract_summary(payload)
-                original_html = _resolve_original_html(payload, path, html_roots)
-                if original_html:
+        if args.incremental:
+            manifest = Manifest(cur, "te", json_root)
+        if not args.dry_run:
+            writer = BatchWriter(
+                conn, cur, TARGET, args.batch_size, args.commit_every, args.copy, args.verbose, manifest, checkpoint
+            )
+        retry_paths = checkpoint.retry_paths if checkpoint is not None else []
+        paths = itertools.chain(retry_paths, scanner)
+        tasks = manifest.changed(paths) if manifest is not None else ((path, None) for path in paths)
+        parsed = _iter_parsed(tasks, html_index, workers, incremental=manifest is not None)
+
+        for index, (path, row, error, fingerprint) in enumerate(parsed, start=1):
+            if checkpoint is not None:
+                checkpoint.retried(path)
+            if row is None and error is None:
+                # Touched but identical content: only refresh size/mtime in the manifest.
+                manifest.skipped += 1
+                if writer is not None:
+                    manifest.record(path, fingerprint)
+                if args.verbose:
+                    print(f"[import] {index:>6}: skipped (content unchanged) path={path}")
+                continue
+            if row is None:
+                failed += 1
+                print(f"[import] ERROR {path}: {error}", file=sys.stderr)
+                if checkpoint is not None:
+                    checkpoint.fail(path)
+                continue
+            try:
+                if row["original_html"]:
                     with_html += 1
 
-                row = {
-                    "stable_key": stable_key,
-                    "normalized_gz": normalized_gz,
-                    "geschaeftszahl": geschaeftszahl,
-                    "datum": datum,
-                    "entscheidungsdatum": entscheidungsdatum,
-                    "summary": summary,
-                    "source_json": Json(payload),
-                    "original_html": original_html,
-                }
-
-                if args.dry_run:
+                if writer is None:
                     if args.verbose:
                         print(
-                            f"[dry-run] {index:>6}: key={stable_key} gz={geschaeftszahl or '-'} "
-                            f"date={entscheidungsdatum or datum or '-'} html={'yes' if original_html else 'no'}"
+                            f"[dry-run] {index:>6}: key={row['stable_key']} gz={row['geschaeftszahl'] or '-'} "
+                            f"date={row['entscheidungsdatum'] or row['datum'] or '-'} "
+                            f"html={'yes' if row['original_html'] else 'no'}"
                         )
                     continue
 
-                assert cur is not None
-                savepoint_name = f"sp_te_{index}"
-                cur.execute(f"SAVEPOINT {savepoint_name}")
-                try:
-                    cur.execute(UPSERT_SQL, row)
-                    res = cur.fetchone()
-                    cur.execute(f"RELEASE SAVEPOINT {savepoint_name}")
-                except Exception:
-                    cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint_name}")
-                    cur.execute(f"RELEASE SAVEPOINT {savepoint_name}")
-                    raise
-                if res and bool(res[0]):
-                    inserted += 1
-                    action = "inserted"
-                else:
-                    updated += 1
-                    action = "updated"
-
-                if args.verbose:
-                    print(
-                        f"[import] {index:>6}: {action} key={stable_key} "
-                        f"html={'yes' if original_html else 'no'}"
-                    )
-                upserted_since_commit += 1
-                if (
-                    conn is not None
-                    and args.commit_every > 0
-                    and upserted_since_commit >= args.commit_every
-                ):
-                    conn.commit()
-                    upserted_since_commit = 0
+                writer.add(index, path, row, fingerprint)
 
             except Exception as exc:  # keep loop robust
                 failed += 1
                 print(f"[import] ERROR {path}: {exc}", file=sys.stderr)
+                if checkpoint is not None:
+                    checkpoint.fail(path)
 
-        if not args.dry_run and conn is not None:
+        if writer is not None:
+            writer.flush()
+            if checkpoint is not None:
+                checkpoint.clear(cur)
             conn.commit()
 
     except Exception as exc:
@@ -508,15 +832,27 @@ def main() -> int:
         print(f"[import] fatal: {exc}", file=sys.stderr)
         return 1
     finally:
+        if parsed is not None:
+            parsed.close()
         if cur is not None:
             cur.close()
         if conn is not None:
             conn.close()
 
-    processed = len(files)
+    processed = scanner.scanned + len(retry_paths)
+    if processed == 0:
+        print(f"[import] no files matched {args.glob} under {json_root}")
+        return 0
+
+    inserted = writer.inserted if writer is not None else 0
+    updated = writer.updated if writer is not None else 0
+    unchanged = writer.unchanged if writer is not None else 0
+    failed += writer.failed if writer is not None else 0
+    skipped_unchanged = manifest.skipped if manifest is not None else 0
     print(
         "[import] done "
-        f"processed={processed} inserted={inserted} updated={updated} failed={failed} with_html={with_html} dry_run={args.dry_run}"
+        f"processed={processed} inserted={inserted} updated={updated} unchanged={unchanged} failed={failed} "
+        f"skipped_unchanged={skipped_unchanged} with_html={with_html} dry_run={args.dry_run}"
     )
     return 1 if failed > 0 and not args.dry_run else 0
 